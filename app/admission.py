@@ -0,0 +1,244 @@
+import asyncio
+import heapq
+import itertools
+import math
+import re
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, List, Optional
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.models import Priority
+from app.services.roster_store import get_roster_store
+
+
+class RequestClass(IntEnum):
+    """Scheduling classes; lower values are served first"""
+    CRITICAL = 0  # anything about a critical mission
+    WRITE = 1     # assignments and status changes
+    READ = 2      # targeted lookups
+    BULK = 3      # roster listings and reports
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0, or the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Bounded priority queue in front of a fixed number of execution slots.
+    When a slot frees up, the most urgent waiting request gets it. A full
+    queue or a wait longer than `queue_timeout` is rejected with a
+    Retry-After estimate instead of running into the client's timeout.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: List[tuple] = []
+        self._queued: Dict[RequestClass, int] = {c: 0 for c in RequestClass}
+        self._counter = itertools.count()
+        # Moving average of how long a request holds a slot
+        self._service_time = 1.0
+
+    def retry_after(self, ahead: int) -> float:
+        return max(1.0, self._service_time * (ahead + 1) / self.max_concurrent)
+
+    async def acquire(self, request_class: RequestClass):
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        if self._queued[request_class] >= self.max_queue:
+            raise Rejected(f"{self.name} queue is full", self.retry_after(len(self._waiters)))
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [int(request_class), next(self._counter), future]
+        heapq.heappush(self._waiters, entry)
+        self._queued[request_class] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # cancel() fails if the slot was granted just as we timed out
+            if not future.cancel():
+                return
+            raise Rejected(f"{self.name} is overloaded", self.retry_after(len(self._waiters)))
+        except asyncio.CancelledError:
+            # Client went away; give back a slot we may have been handed
+            if not future.cancel():
+                self.release(0)
+            raise
+        finally:
+            self._queued[request_class] -= 1
+
+    def release(self, held_for: float):
+        self._service_time = 0.8 * self._service_time + 0.2 * held_for
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter
+                future.set_result(True)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def admit(self, request_class: RequestClass):
+        await self.acquire(request_class)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+
+class AdmissionPolicy:
+    """
+    Per-client rate limits plus one admission queue for the agent and one
+    for the REST API.
+
+    Clients are told apart by remote address. Only peers listed in
+    `admission_trusted_proxies`, such as the Streamlit UI that relays many
+    browser sessions, may name the client with an X-Client-Id header.
+    """
+
+    TOKEN = re.compile(r"[A-Za-z0-9_-]+")
+    WRITE_WORDS = {"assign", "reassign", "update", "status", "leave", "apply", "set", "mark"}
+    BULK_WORDS = {"all", "list", "show", "fleet", "report", "readiness", "every"}
+    BULK_PATHS = {"/api/pilots", "/api/drones", "/api/missions", "/api/readiness"}
+
+    def __init__(self):
+        settings = get_settings()
+        # The agent has a single chat session, so chats run one at a time
+        self.chat = AdmissionController(
+            "Agent",
+            settings.admission_chat_concurrency,
+            settings.admission_max_queue,
+            settings.admission_queue_timeout
+        )
+        self.api = AdmissionController(
+            "API",
+            settings.admission_api_concurrency,
+            settings.admission_max_queue,
+            settings.admission_queue_timeout
+        )
+        self.rate = settings.admission_client_rate
+        self.burst = settings.admission_client_burst
+        self.trusted_proxies = {
+            host.strip() for host in settings.admission_trusted_proxies.split(",") if host.strip()
+        }
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._next_sweep = 0.0
+
+    def client_id(self, request: Request) -> str:
+        host = request.client.host if request.client else "unknown"
+        if host in self.trusted_proxies:
+            forwarded = request.headers.get("x-client-id")
+            if forwarded:
+                return f"{host}/{forwarded}"
+        return host
+
+    def _sweep(self):
+        """Drop buckets that have refilled completely; they are the same as new ones"""
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        refill = self.burst / self.rate
+        self._next_sweep = now + max(1.0, refill)
+        idle = [client for client, bucket in self._buckets.items() if now - bucket.updated >= refill]
+        for client in idle:
+            del self._buckets[client]
+
+    def check_rate(self, client: str, request_class: RequestClass):
+        # Critical work is never throttled per client
+        if request_class == RequestClass.CRITICAL or self.rate <= 0:
+            return
+        self._sweep()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+        wait = bucket.take()
+        if wait:
+            raise Rejected("Rate limit exceeded", wait)
+
+    def _mentions_critical_mission(self, tokens: List[str]) -> bool:
+        roster = get_roster_store()
+        for token in tokens:
+            mission = roster.get_mission_by_id(token)
+            if mission and mission.priority == Priority.CRITICAL:
+                return True
+        return False
+
+    def classify_chat(self, message: str) -> RequestClass:
+        tokens = self.TOKEN.findall(message)
+        if self._mentions_critical_mission(tokens):
+            return RequestClass.CRITICAL
+        words = {t.lower() for t in tokens}
+        if words & self.WRITE_WORDS:
+            return RequestClass.WRITE
+        if words & self.BULK_WORDS:
+            return RequestClass.BULK
+        return RequestClass.READ
+
+    def classify_api(self, request: Request) -> RequestClass:
+        path = request.url.path.rstrip("/")
+        if request.method in ("POST", "PUT", "PATCH", "DELETE"):
+            if self._mentions_critical_mission(path.split("/")):
+                return RequestClass.CRITICAL
+            return RequestClass.WRITE
+        if path in self.BULK_PATHS:
+            return RequestClass.BULK
+        return RequestClass.READ
+
+    @asynccontextmanager
+    async def admit(self, controller: AdmissionController, request: Request, request_class: RequestClass):
+        """Rate-limit and queue a request, turning rejections into 429 responses"""
+        try:
+            self.check_rate(self.client_id(request), request_class)
+            async with controller.admit(request_class):
+                yield
+        except Rejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=e.reason,
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+
+
+admission = AdmissionPolicy()
+
+
+async def admit_api_request(request: Request):
+    """Router dependency that holds an API slot for the duration of the request"""
+    if request.url.path == "/api/roster/version":
+        # Cheap, polled constantly; never queued
+        yield
+        return
+    request_class = await run_in_threadpool(admission.classify_api, request)
+    async with admission.admit(admission.api, request, request_class):
+        yield
@@ -1,31 +1,41 @@
 from google import genai
 from google.genai import types
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 import json
 from app.config import get_settings
-from app.tools import TOOLS, ToolExecutor
+from app.tools import TOOLS, WRITE_TOOLS, ToolExecutor
 
 class DroneAgent:
     def __init__(self):
         settings = get_settings()
-        
+
         # 1. Initialize the new Client
         self.client = genai.Client(api_key=settings.google_api_key)
-        
+
         # 2. Set the correct model ID (Gemini 2.0 Flash is the latest stable)
         self.model_id = "gemini-2.5-flash"
-        
+
         # 3. Setup Tool Configuration
-        # In the new SDK, 'automatic_function_calling' handles the execution loop for you.
+        # We run the function-calling loop ourselves (see chat()) so that
+        # independent read-only tools from one turn can run in parallel.
         # Note: 'TOOLS' should be a list of the actual Python functions from your tools.py
         self.config = types.GenerateContentConfig(
             tools=TOOLS,
             automatic_function_calling=types.AutomaticFunctionCallingConfig(
-                disable=False
+                disable=True
             )
         )
-        
-        # 4. Create a chat session to maintain history automatically
+
+        # 4. Tool lookup and worker pool for the execution loop
+        self.tool_functions = {fn.__name__: fn for fn in TOOLS}
+        self.max_tool_iterations = settings.agent_max_tool_iterations
+        self.tool_pool = ThreadPoolExecutor(
+            max_workers=settings.agent_tool_workers,
+            thread_name_prefix="agent-tool"
+        )
+
+        # 5. Create a chat session to maintain history automatically
         self._setup_session()
 
     def _setup_session(self):
@@ -35,21 +45,98 @@ class DroneAgent:
             config=self.config
         )
 
+    def _run_tool(self, call) -> Dict[str, Any]:
+        """Run a single function call and wrap its output for the model"""
+        fn = self.tool_functions.get(call.name)
+        if fn is None:
+            return {"error": f"Unknown tool: {call.name}"}
+        try:
+            return {"result": fn(**(call.args or {}))}
+        except Exception as e:
+            print(f"Error in tool {call.name}: {str(e)}")
+            return {"error": str(e)}
+
+    def _execute_tool_calls(self, calls) -> List[types.Part]:
+        """
+        Execute the function calls requested in one model turn.
+        Consecutive read-only calls run concurrently on the worker pool;
+        write tools act as barriers and run one at a time, in the order
+        the model asked for them.
+        """
+        results: List[Dict[str, Any]] = [None] * len(calls)
+        pending = []
+
+        def drain():
+            for index, future in pending:
+                results[index] = future.result()
+            pending.clear()
+
+        for index, call in enumerate(calls):
+            if call.name in WRITE_TOOLS:
+                drain()
+                results[index] = self._run_tool(call)
+            else:
+                pending.append((index, self.tool_pool.submit(self._run_tool, call)))
+        drain()
+
+        return [
+            types.Part.from_function_response(name=call.name, response=result)
+            for call, result in zip(calls, results)
+        ]
+
+    def _abandon_tool_calls(self, calls):
+        """
+        Answer calls left over when the budget runs out with errors, so the
+        model turn that asked for them is closed in the session history.
+        If the model still wants tools after that, start a fresh session.
+        """
+        parts = [
+            types.Part.from_function_response(
+                name=call.name,
+                response={"error": "Tool iteration budget exhausted; call was not executed"}
+            )
+            for call in calls
+        ]
+        try:
+            response = self.chat_session.send_message(parts)
+            if not response.function_calls:
+                return
+        except Exception as e:
+            print(f"Error closing abandoned tool calls: {str(e)}")
+        self._setup_session()
+
     def chat(self, user_message: str) -> str:
         """
         Send message to agent and get response.
-        The SDK handles function calls and history internally.
+        Tool calls are executed here until the model returns text or the
+        iteration budget runs out.
         """
+        calls = None
         try:
             # Send message to the session
             response = self.chat_session.send_message(user_message)
-            
-            # The SDK automatically executes tools and re-prompts the model 
-            # until a final text response is generated.
-            return response.text
-            
+
+            for _ in range(self.max_tool_iterations):
+                calls = response.function_calls
+                if not calls:
+                    return response.text
+                parts = self._execute_tool_calls(calls)
+                response = self.chat_session.send_message(parts)
+
+            calls = response.function_calls
+            if not calls:
+                return response.text
+            self._abandon_tool_calls(calls)
+            return (
+                "I stopped after reaching the limit of "
+                f"{self.max_tool_iterations} tool rounds. Please narrow down your request."
+            )
+
         except Exception as e:
             print(f"Error in DroneAgent.chat: {str(e)}")
+            if calls:
+                # The model's tool-call turn was never answered in the history
+                self._setup_session()
             return f"I encountered an error processing your request: {str(e)}"
 
     def reset(self):
@@ -59,4 +146,4 @@ class DroneAgent:
 
     def get_history(self):
         """Optional: Helper to view current session history"""
-        return self.chat_session.history
\ No newline at end of file
+        return self.chat_session.history
@@ -0,0 +1,272 @@
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from app.admission import admit_api_request
+from app.models import (
+    Pilot, Drone, Mission, PilotStatus, DroneStatus, Priority, Page,
+    AssignmentResult, MissionSuitability, AvailabilityResult, PilotStatusUpdate,
+    ReassignmentProposal
+)
+from app.services.lock_manager import lock_manager, pilot_key
+from app.tools import executor
+
+# Typed JSON API for machine clients. It shares the roster store and the
+# cached services with the agent's tools.
+router = APIRouter(prefix="/api", tags=["api"], dependencies=[Depends(admit_api_request)])
+
+roster = executor.roster
+
+
+def _etag() -> str:
+    """ETag for anything derived from the roster; changes with its version"""
+    roster.refresh()
+    return f'W/"roster-{roster.version}"'
+
+
+def _not_modified(request: Request, response: Response) -> Optional[Response]:
+    """Set caching headers and return a 304 if the client already has this version"""
+    etag = _etag()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _page(items: list, offset: int, limit: int) -> dict:
+    return {
+        "items": items[offset:offset + limit],
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "version": roster.version
+    }
+
+
+@router.get("/roster/version")
+def roster_version(request: Request, response: Response):
+    """Current roster version; cheap to poll"""
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+    return {"version": roster.version}
+
+
+# PILOTS
+@router.get("/pilots", response_model=Page[Pilot])
+def list_pilots(
+    request: Request,
+    response: Response,
+    status: Optional[PilotStatus] = None,
+    location: Optional[str] = None,
+    skill: List[str] = Query(default=[]),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0)
+):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    pilots = roster.get_all_pilots()
+    if status:
+        pilots = [p for p in pilots if p.status == status]
+    if location:
+        pilots = [p for p in pilots if p.location == location]
+    if skill:
+        required_skills = set(skill)
+        pilots = [p for p in pilots if required_skills.issubset(p.skills)]
+    return _page(pilots, offset, limit)
+
+
+@router.get("/pilots/{pilot_id}", response_model=Pilot)
+def get_pilot(pilot_id: str, request: Request, response: Response):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    pilot = roster.get_pilot_by_id(pilot_id)
+    if not pilot:
+        raise HTTPException(status_code=404, detail=f"Pilot {pilot_id} not found")
+    return pilot
+
+
+@router.put("/pilots/{pilot_id}/status", response_model=Pilot)
+def update_pilot_status(pilot_id: str, update: PilotStatusUpdate):
+    try:
+        with lock_manager.hold(pilot_key(pilot_id)):
+            success = roster.update_pilot_status(pilot_id, update.status.value)
+    except TimeoutError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not success:
+        raise HTTPException(status_code=404, detail=f"Pilot {pilot_id} not found")
+    return roster.get_pilot_by_id(pilot_id)
+
+
+# DRONES
+@router.get("/drones", response_model=Page[Drone])
+def list_drones(
+    request: Request,
+    response: Response,
+    status: Optional[DroneStatus] = None,
+    location: Optional[str] = None,
+    capability: List[str] = Query(default=[]),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0)
+):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    drones = roster.get_all_drones()
+    if status:
+        drones = [d for d in drones if d.status == status]
+    if location:
+        drones = [d for d in drones if d.location == location]
+    if capability:
+        required_caps = set(capability)
+        drones = [d for d in drones if required_caps.issubset(d.capabilities)]
+    return _page(drones, offset, limit)
+
+
+@router.get("/drones/{drone_id}", response_model=Drone)
+def get_drone(drone_id: str, request: Request, response: Response):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    drone = roster.get_drone_by_id(drone_id)
+    if not drone:
+        raise HTTPException(status_code=404, detail=f"Drone {drone_id} not found")
+    return drone
+
+
+# MISSIONS
+@router.get("/missions", response_model=Page[Mission])
+def list_missions(
+    request: Request,
+    response: Response,
+    priority: Optional[Priority] = None,
+    location: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0)
+):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    missions = roster.get_all_missions()
+    if priority:
+        missions = [m for m in missions if m.priority == priority]
+    if location:
+        missions = [m for m in missions if m.location == location]
+    return _page(missions, offset, limit)
+
+
+@router.get("/missions/{mission_id}", response_model=Mission)
+def get_mission(mission_id: str, request: Request, response: Response):
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    mission = roster.get_mission_by_id(mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    return mission
+
+
+@router.get("/missions/{mission_id}/suitability", response_model=MissionSuitability)
+def mission_suitability(mission_id: str, request: Request, response: Response):
+    """Suitable pilot and drone counts and best candidates for one mission"""
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+
+    row = executor.suitability.get_mission(mission_id)
+    if row:
+        return row
+
+    # Not an open mission: rank against the live roster instead
+    mission = roster.get_mission_by_id(mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    pilots, _ = executor.assignment_service.rank_pilots(mission)
+    drones, _ = executor.assignment_service.rank_drones(mission)
+    top_n = executor.suitability.top_n
+    return MissionSuitability(
+        mission_id=mission.project_id,
+        client=mission.client,
+        location=mission.location,
+        priority=mission.priority,
+        start_date=mission.start_date,
+        end_date=mission.end_date,
+        pilot_count=len(pilots),
+        drone_count=len(drones),
+        best_pilots=[p.pilot_id for p in pilots[:top_n]],
+        best_drones=[d.drone_id for d in drones[:top_n]]
+    )
+
+
+@router.post("/missions/{mission_id}/assign", response_model=AssignmentResult)
+def assign_mission(mission_id: str):
+    """Assign the best pilot and drone; 409 with conflicts if that is not possible"""
+    if not roster.get_mission_by_id(mission_id):
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    result = executor.assignment_service.assign_mission(mission_id)
+    if not result.success:
+        return JSONResponse(status_code=409, content=result.model_dump())
+    return result
+
+
+# FLEET QUERIES
+@router.get("/readiness", response_model=List[MissionSuitability])
+def readiness(request: Request, response: Response):
+    """Suitability matrix for every open mission, most urgent first"""
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+    return executor.suitability.get_matrix()
+
+
+@router.get("/availability", response_model=AvailabilityResult)
+def availability(
+    request: Request,
+    response: Response,
+    start: date,
+    end: date,
+    location: Optional[str] = None,
+    skill: List[str] = Query(default=[]),
+    certification: List[str] = Query(default=[]),
+    capability: List[str] = Query(default=[])
+):
+    """Pilots and drones free for the whole window"""
+    not_modified = _not_modified(request, response)
+    if not_modified:
+        return not_modified
+    try:
+        return executor.availability.search(
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()),
+            location,
+            skill,
+            certification,
+            capability
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+# RE-PLANNING
+@router.get("/replan/proposals", response_model=List[ReassignmentProposal])
+def replan_proposals():
+    """Assignments invalidated by roster changes, with proposed replacements"""
+    return executor.replanner.get_proposals()
+
+
+@router.post("/replan/{mission_id}/apply", response_model=List[ReassignmentProposal])
+def apply_replan(mission_id: str):
+    applied = executor.replanner.apply(mission_id)
+    if not applied:
+        raise HTTPException(status_code=409, detail=f"No applicable proposals for mission {mission_id}")
+    return applied
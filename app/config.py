@@ -11,6 +11,34 @@ class Settings(BaseSettings):
 
     environment: str = "development"
 
+    # Agent tool loop
+    agent_max_tool_iterations: int = 8
+    agent_tool_workers: int = 4
+
+    # Roster cache and write-behind journal
+    roster_refresh_seconds: float = 30
+    journal_path: str = "data/assignment_journal.db"
+    journal_flush_seconds: float = 2
+    journal_batch_size: int = 200
+
+    # Shared roster snapshot (written by the leader worker)
+    roster_snapshot_path: str = "data/roster.snapshot"
+    snapshot_poll_seconds: float = 2
+
+    # Incremental re-planning after roster changes
+    replan_auto_apply: bool = False
+
+    # Admission control (see app/admission.py)
+    admission_chat_concurrency: int = 1
+    admission_api_concurrency: int = 8
+    admission_max_queue: int = 50
+    admission_queue_timeout: float = 30
+    admission_client_rate: float = 2
+    admission_client_burst: float = 10
+    # Comma-separated peer addresses (e.g. the UI host) whose X-Client-Id
+    # header is trusted; everyone else is rate-limited by address
+    admission_trusted_proxies: str = "127.0.0.1,::1"
+
     class Config:
         env_file = ".env"
 
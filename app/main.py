@@ -1,7 +1,12 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from app.agent import DroneAgent
+from app.admission import RequestClass, admission
+from app.api import router as api_router
+from app.services.roster_store import get_roster_store
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 app = FastAPI(title="Drone Fleet AI Agent")
 
@@ -12,8 +17,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress larger JSON responses (roster listings, readiness reports)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+app.include_router(api_router)
+
 # Global agent instance
 agent = DroneAgent()
 
@@ -24,20 +35,42 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     response: str
 
+@app.get("/health")
+async def health():
+    """Cheap liveness check; never touches Sheets or the model"""
+    roster = get_roster_store()
+    return {
+        "status": "ok",
+        "roster_version": roster.version,
+        "leader": roster.is_leader
+    }
+
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """Chat endpoint"""
-    try:
-        response = agent.chat(request.message)
-        return ChatResponse(response=response)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def chat(request: ChatRequest, http_request: Request):
+    """Chat endpoint. Queued by priority; 429 with Retry-After when overloaded."""
+    # Classifying may refresh the roster, so keep it off the event loop
+    request_class = await run_in_threadpool(admission.classify_chat, request.message)
+    async with admission.admit(admission.chat, http_request, request_class):
+        try:
+            response = await run_in_threadpool(agent.chat, request.message)
+            return ChatResponse(response=response)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
     
 
+@app.on_event("shutdown")
+def shutdown():
+    """Flush pending journal entries to Sheets before exiting"""
+    get_roster_store().close()
+
+
 @app.post("/reset")
-async def reset():
+async def reset(http_request: Request):
     """Reset chat history"""
-    agent.reset()
+    # Wait for the running chat so its session isn't swapped out mid-turn
+    async with admission.admit(admission.chat, http_request, RequestClass.WRITE):
+        agent.reset()
     return {"message": "Chat history reset"}
 
 
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from enum import Enum
 
 
@@ -25,6 +25,15 @@ class Priority(str, Enum):
     CRITICAL = "critical"
 
 
+# Higher number = more important
+PRIORITY_RANK = {
+    Priority.LOW: 0,
+    Priority.MEDIUM: 1,
+    Priority.HIGH: 2,
+    Priority.CRITICAL: 3,
+}
+
+
 class Pilot(BaseModel):
     pilot_id: str
     name: str
@@ -68,4 +77,51 @@ class AssignmentResult(BaseModel):
 class ConflictCheck(BaseModel):
     has_conflict: bool
     conflict_type: Optional[str] = None
-    details: List[str] = []
\ No newline at end of file
+    details: List[str] = []
+
+
+class MissionSuitability(BaseModel):
+    mission_id: str
+    client: str
+    location: str
+    priority: Priority
+    start_date: datetime
+    end_date: datetime
+    pilot_count: int
+    drone_count: int
+    best_pilots: List[str] = []
+    best_drones: List[str] = []
+
+
+class AvailabilityResult(BaseModel):
+    start: datetime
+    end: datetime
+    location: Optional[str] = None
+    pilots: List[Pilot] = []
+    drones: List[Drone] = []
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    total: int
+    offset: int
+    limit: int
+    version: str
+
+
+class PilotStatusUpdate(BaseModel):
+    status: PilotStatus
+
+
+class ReassignmentProposal(BaseModel):
+    mission_id: str
+    priority: Priority
+    role: str  # "pilot" or "drone"
+    reason: str
+    current: Optional[str] = None
+    replacement: Optional[str] = None
+    preempted_mission: Optional[str] = None
+    applied: bool = False
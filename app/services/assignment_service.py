@@ -1,147 +1,243 @@
 from typing import Optional, List, Tuple
+from datetime import timedelta
 from app.models import Pilot, Drone, Mission, AssignmentResult, Priority
-from app.services.sheets_service import SheetsService
+from app.services.roster_store import get_roster_store, pilot_state, drone_state
 from app.services.conflict_detector import ConflictDetector
+from app.services.lock_manager import lock_manager, pilot_key, drone_key, mission_key
+
+
+def score_pilot(pilot: Pilot, mission: Mission) -> int:
+    """Ranking score for a pilot that has no conflicts with the mission"""
+    score = 0
+    # Exact location match
+    if pilot.location == mission.location:
+        score += 10
+    # Skills match
+    skill_match = len(set(pilot.skills) & set(mission.required_skills))
+    score += skill_match * 5
+    # Certification match
+    cert_match = len(set(pilot.certifications) & set(mission.required_certs))
+    score += cert_match * 5
+    return score
+
+
+def score_drone(drone: Drone, mission: Mission) -> int:
+    """Ranking score for a drone that has no conflicts with the mission"""
+    score = 0
+    # Exact location match
+    if drone.location == mission.location:
+        score += 10
+    # Capability count
+    score += len(drone.capabilities) * 2
+    return score
 
 
 class AssignmentService:
     def __init__(self):
-        self.sheets = SheetsService()
+        self.roster = get_roster_store()
         self.conflict_detector = ConflictDetector()
-    
-    def find_best_pilot(
-        self, 
+        self.locks = lock_manager
+
+    def rank_pilots(
+        self,
         mission: Mission,
         pilots: Optional[List[Pilot]] = None
-    ) -> Tuple[Optional[Pilot], List[str]]:
-        """Find best pilot for mission"""
+    ) -> Tuple[List[Pilot], List[str]]:
+        """Return suitable pilots for mission, best first, plus issues for the rest"""
         if pilots is None:
-            pilots = self.sheets.get_all_pilots()
-        
+            pilots = self.roster.get_all_pilots()
+
         candidates = []
         all_issues = []
-        
+
         for pilot in pilots:
             conflict_check = self.conflict_detector.check_pilot_availability(pilot, mission)
-            
+
             if not conflict_check.has_conflict:
-                # Calculate score
-                score = 0
-                # Exact location match
-                if pilot.location == mission.location:
-                    score += 10
-                # Skills match
-                skill_match = len(set(pilot.skills) & set(mission.required_skills))
-                score += skill_match * 5
-                # Certification match
-                cert_match = len(set(pilot.certifications) & set(mission.required_certs))
-                score += cert_match * 5
-                
-                candidates.append((pilot, score))
+                candidates.append((pilot, score_pilot(pilot, mission)))
             else:
                 all_issues.extend(conflict_check.details)
-        
-        if candidates:
-            # Sort by score
-            candidates.sort(key=lambda x: x[1], reverse=True)
-            return candidates[0][0], []
-        
-        return None, all_issues
-    
-    def find_best_drone(
+
+        # Sort by score
+        candidates.sort(key=lambda x: x[1], reverse=True)
+        return [pilot for pilot, _ in candidates], all_issues
+
+    def rank_drones(
         self,
         mission: Mission,
         drones: Optional[List[Drone]] = None
-    ) -> Tuple[Optional[Drone], List[str]]:
-        """Find best drone for mission"""
+    ) -> Tuple[List[Drone], List[str]]:
+        """Return suitable drones for mission, best first, plus issues for the rest"""
         if drones is None:
-            drones = self.sheets.get_all_drones()
-        
+            drones = self.roster.get_all_drones()
+
         candidates = []
         all_issues = []
-        
+
         for drone in drones:
             conflict_check = self.conflict_detector.check_drone_availability(drone, mission)
-            
+
             if not conflict_check.has_conflict:
-                # Calculate score
-                score = 0
-                # Exact location match
-                if drone.location == mission.location:
-                    score += 10
-                # Capability count
-                score += len(drone.capabilities) * 2
-                
-                candidates.append((drone, score))
+                candidates.append((drone, score_drone(drone, mission)))
             else:
                 all_issues.extend(conflict_check.details)
-        
-        if candidates:
-            candidates.sort(key=lambda x: x[1], reverse=True)
-            return candidates[0][0], []
-        
-        return None, all_issues
-    
+
+        candidates.sort(key=lambda x: x[1], reverse=True)
+        return [drone for drone, _ in candidates], all_issues
+
+    def find_best_pilot(
+        self,
+        mission: Mission,
+        pilots: Optional[List[Pilot]] = None
+    ) -> Tuple[Optional[Pilot], List[str]]:
+        """Find best pilot for mission"""
+        ranked, issues = self.rank_pilots(mission, pilots)
+        if ranked:
+            return ranked[0], []
+        return None, issues
+
+    def find_best_drone(
+        self,
+        mission: Mission,
+        drones: Optional[List[Drone]] = None
+    ) -> Tuple[Optional[Drone], List[str]]:
+        """Find best drone for mission"""
+        ranked, issues = self.rank_drones(mission, drones)
+        if ranked:
+            return ranked[0], []
+        return None, issues
+
     def assign_mission(self, mission_id: str) -> AssignmentResult:
         """Assign pilot and drone to mission"""
-        mission = self.sheets.get_mission_by_id(mission_id)
-        
+        try:
+            with self.locks.hold(mission_key(mission_id)):
+                return self._assign_locked(mission_id)
+        except TimeoutError as e:
+            return AssignmentResult(
+                success=False,
+                message=f"Mission {mission_id} is already being assigned",
+                conflicts=[str(e)]
+            )
+
+    def _assign_locked(self, mission_id: str) -> AssignmentResult:
+        mission = self.roster.get_mission_by_id(mission_id)
+
         if not mission:
             return AssignmentResult(
                 success=False,
                 message=f"Mission {mission_id} not found"
             )
-        
-        # Find best pilot
-        pilot, pilot_issues = self.find_best_pilot(mission)
-        
-        # Find best drone
-        drone, drone_issues = self.find_best_drone(mission)
-        
-        if not pilot:
+
+        # Pick up changes other workers have journaled since our last refresh
+        self.roster.sync_journal()
+
+        # A retried request must not staff the mission a second time
+        staffed = self._already_staffed(mission_id)
+        if staffed:
+            return staffed
+
+        # Rank pilots and drones from one roster snapshot
+        pilots, pilot_issues = self.rank_pilots(mission)
+        drones, drone_issues = self.rank_drones(mission)
+
+        if not pilots:
             return AssignmentResult(
                 success=False,
                 message="No suitable pilot found",
                 conflicts=pilot_issues
             )
-        
-        if not drone:
+
+        if not drones:
             return AssignmentResult(
                 success=False,
                 message="No suitable drone found",
                 conflicts=drone_issues
             )
-        
+
+        # Walk the candidates best-first. A resource that is locked by another
+        # assignment, or that changed since our snapshot, is skipped in
+        # favour of the next-best one.
+        lost_races = []
+        for pilot in pilots:
+            key = pilot_key(pilot.pilot_id)
+            if not self.locks.try_acquire(key):
+                continue
+            try:
+                self.roster.sync_journal()
+                current = self.roster.get_pilot_by_id(pilot.pilot_id)
+                if pilot_state(current) != pilot_state(pilot):
+                    lost_races.append(f"Pilot {pilot.name} changed while assigning")
+                    continue
+                drone = self._claim_drone(drones, lost_races)
+                if drone is None:
+                    break
+                try:
+                    result = self._write_assignment(mission, pilot, drone)
+                finally:
+                    self.locks.release(drone_key(drone.drone_id))
+                if result is not None:
+                    return result
+                # Another worker changed the pilot or drone, or staffed the mission, first
+                staffed = self._already_staffed(mission_id)
+                if staffed:
+                    return staffed
+                lost_races.append(f"Pilot {pilot.name} or drone {drone.drone_id} was taken by another worker")
+            finally:
+                self.locks.release(key)
+
+        return AssignmentResult(
+            success=False,
+            message="All suitable pilots and drones were taken by concurrent assignments, please retry",
+            conflicts=lost_races or ["Candidates busy"]
+        )
+
+    def _already_staffed(self, mission_id: str) -> Optional[AssignmentResult]:
+        """Failed result naming the current crew if the mission already has one"""
+        pilots, drones = self.roster.get_mission_staff(mission_id)
+        if not pilots and not drones:
+            return None
+        crew = [p.name for p in pilots] + [d.drone_id for d in drones]
+        return AssignmentResult(
+            success=False,
+            message=f"Mission {mission_id} is already assigned to {' and '.join(crew)}",
+            conflicts=["Mission already staffed"],
+            assigned_pilot=pilots[0].name if pilots else None,
+            assigned_drone=drones[0].drone_id if drones else None
+        )
+
+    def _claim_drone(self, drones: List[Drone], lost_races: List[str]) -> Optional[Drone]:
+        """
+        Lock the best drone that is free and unchanged since the snapshot.
+        The caller must release the returned drone's lock.
+        """
+        for drone in drones:
+            key = drone_key(drone.drone_id)
+            if not self.locks.try_acquire(key):
+                continue
+            current = self.roster.get_drone_by_id(drone.drone_id)
+            if current is not None and drone_state(current) == drone_state(drone):
+                return drone
+            lost_races.append(f"Drone {drone.drone_id} changed while assigning")
+            self.locks.release(key)
+        return None
+
+    def _write_assignment(self, mission: Mission, pilot: Pilot, drone: Drone) -> Optional[AssignmentResult]:
+        """Record the assignment; None if another worker changed the pilot or drone first"""
+        mission_id = mission.project_id
+
         # Calculate available_from date (1 day after mission end)
-        from datetime import timedelta
         available_from_date = None
         if mission.end_date:
             available_from_date = mission.end_date + timedelta(days=1)
-        
-        # Update sheets
-        pilot_updated = self.sheets.update_pilot_assignment(
-            pilot.pilot_id, 
-            "assigned", 
-            mission_id,
-            available_from_date
-        )
-        
-        drone_updated = self.sheets.update_drone_status(
-            drone.drone_id,
-            "in_use",
-            mission_id
+
+        # Record pilot and drone in one journal transaction; the roster
+        # updates now, Sheets shortly after
+        if not self.roster.record_assignment(pilot, drone, mission_id, available_from_date):
+            return None
+
+        return AssignmentResult(
+            success=True,
+            message=f"Successfully assigned {pilot.name} and {drone.drone_id} to mission {mission_id}. Pilot available from {available_from_date.strftime('%Y-%m-%d') if available_from_date else 'N/A'}",
+            assigned_pilot=pilot.name,
+            assigned_drone=drone.drone_id
         )
-        
-        if pilot_updated and drone_updated:
-            return AssignmentResult(
-                success=True,
-                message=f"Successfully assigned {pilot.name} and {drone.drone_id} to mission {mission_id}. Pilot available from {available_from_date.strftime('%Y-%m-%d') if available_from_date else 'N/A'}",
-                assigned_pilot=pilot.name,
-                assigned_drone=drone.drone_id
-            )
-        else:
-            return AssignmentResult(
-                success=False,
-                message="Failed to update sheets",
-                conflicts=["Sheet update failed"]
-            )
\ No newline at end of file
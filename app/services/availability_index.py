@@ -0,0 +1,106 @@
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Optional
+from app.models import Pilot, Drone, AvailabilityResult
+from app.services.roster_store import get_roster_store
+
+# Key used for the fleet-wide bucket when no location filter is given
+ALL_LOCATIONS = "*"
+
+
+class _Bucket:
+    """Pilots sorted by available_from and drones sorted by maintenance_due"""
+
+    def __init__(self):
+        self.pilots: List[Pilot] = []
+        self.pilot_dates: List[datetime] = []
+        self.drones: List[Drone] = []
+        self.drone_dates: List[datetime] = []
+
+    def add_pilot(self, pilot: Pilot):
+        self.pilots.append(pilot)
+
+    def add_drone(self, drone: Drone):
+        self.drones.append(drone)
+
+    def seal(self):
+        # No date means free now / no maintenance scheduled
+        self.pilots.sort(key=lambda p: p.available_from or datetime.min)
+        self.pilot_dates = [p.available_from or datetime.min for p in self.pilots]
+        self.drones.sort(key=lambda d: d.maintenance_due or datetime.max)
+        self.drone_dates = [d.maintenance_due or datetime.max for d in self.drones]
+
+
+class AvailabilityIndex:
+    """
+    Answers "who can fly between start and end" with two bisections per
+    location instead of a scan of the whole fleet.
+
+    A pilot qualifies if they are available, or assigned with an
+    available_from date, and that date is on or before the window start.
+    A drone qualifies if it is available and its maintenance is due after
+    the window end. The index is rebuilt when the roster version changes.
+    """
+
+    def __init__(self):
+        self.roster = get_roster_store()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _current(self) -> Dict[str, _Bucket]:
+        self.roster.refresh()
+        with self._lock:
+            if self._version != self.roster.version:
+                version = self.roster.version
+                self._buckets = self._build(self.roster.get_all_pilots(), self.roster.get_all_drones())
+                self._version = version
+            return self._buckets
+
+    def _build(self, pilots: List[Pilot], drones: List[Drone]) -> Dict[str, _Bucket]:
+        buckets: Dict[str, _Bucket] = defaultdict(_Bucket)
+        for pilot in pilots:
+            if pilot.status == "available" or (pilot.status == "assigned" and pilot.available_from):
+                buckets[pilot.location].add_pilot(pilot)
+                buckets[ALL_LOCATIONS].add_pilot(pilot)
+        for drone in drones:
+            if drone.status == "available":
+                buckets[drone.location].add_drone(drone)
+                buckets[ALL_LOCATIONS].add_drone(drone)
+        for bucket in buckets.values():
+            bucket.seal()
+        return dict(buckets)
+
+    def search(
+        self,
+        start: datetime,
+        end: datetime,
+        location: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        certifications: Optional[List[str]] = None,
+        capabilities: Optional[List[str]] = None
+    ) -> AvailabilityResult:
+        """Pilots and drones free for the whole window, optionally filtered"""
+        if end < start:
+            raise ValueError("Window end must not be before its start")
+
+        bucket = self._current().get(location or ALL_LOCATIONS)
+        if bucket is None:
+            return AvailabilityResult(start=start, end=end, location=location)
+
+        pilots = bucket.pilots[:bisect_right(bucket.pilot_dates, start)]
+        drones = bucket.drones[bisect_right(bucket.drone_dates, end):]
+
+        if skills:
+            required_skills = set(skills)
+            pilots = [p for p in pilots if required_skills.issubset(p.skills)]
+        if certifications:
+            required_certs = set(certifications)
+            pilots = [p for p in pilots if required_certs.issubset(p.certifications)]
+        if capabilities:
+            required_caps = set(capabilities)
+            drones = [d for d in drones if required_caps.issubset(d.capabilities)]
+
+        return AvailabilityResult(start=start, end=end, location=location, pilots=pilots, drones=drones)
@@ -58,11 +58,12 @@ class ConflictDetector:
         if drone.status != "available":
             conflicts.append(f"Drone {drone.drone_id} is currently {drone.status}")
         
-        # Check maintenance
-        if drone.maintenance_due and mission.start_date:
-            if drone.maintenance_due <= mission.start_date:
+        # Check maintenance: the drone must not fall due before the mission is over
+        mission_end = mission.end_date or mission.start_date
+        if drone.maintenance_due and mission_end:
+            if drone.maintenance_due <= mission_end:
                 conflicts.append(
-                    f"Maintenance due before mission start: {drone.maintenance_due.strftime('%Y-%m-%d')}"
+                    f"Maintenance due before mission ends: {drone.maintenance_due.strftime('%Y-%m-%d')}"
                 )
         
         # Check location
@@ -0,0 +1,300 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+
+
+# Entry states in the `flushed` column
+PENDING = 0
+FLUSHED = 1
+# Could never be written, e.g. the row was deleted from the sheet
+FAILED = 2
+
+ENTRY_COLUMNS = "id, resource_type, resource_id, changes, flushed"
+
+
+class JournalEntry:
+    def __init__(self, entry_id: int, resource_type: str, resource_id: str, changes: Dict[str, Any], state: int):
+        self.entry_id = entry_id
+        self.resource_type = resource_type
+        self.resource_id = resource_id
+        self.changes = changes
+        self.state = state
+
+    @property
+    def flushed(self) -> bool:
+        return self.state == FLUSHED
+
+
+class AssignmentJournal:
+    """
+    Append-only SQLite log of pilot and drone changes.
+    Entries stay pending until they have been written to Google Sheets,
+    then become flushed, or failed if Sheets can never take them.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Several workers may share one journal file
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                resource_type TEXT NOT NULL,
+                resource_id TEXT NOT NULL,
+                changes TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                flushed INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "flushed_at" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN flushed_at REAL")
+        if "error" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN error TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_pending ON entries (flushed, id)")
+
+    def append(self, resource_type: str, resource_id: str, changes: Dict[str, Any]) -> int:
+        """Durably record a change and return its entry id"""
+        return self.append_if([(resource_type, resource_id, changes)])[0]
+
+    def append_if(
+        self,
+        writes: List[Tuple[str, str, Dict[str, Any]]],
+        since: int = 0,
+        check: Optional[Callable[[List[JournalEntry]], bool]] = None
+    ) -> Optional[List[int]]:
+        """
+        Append (resource_type, resource_id, changes) entries in one transaction.
+
+        With check, the entries from `since` on are read first and the
+        append only happens if check(entries) returns True. The transaction
+        holds SQLite's write lock from that read until the insert, so no
+        other worker can append in between. Returns the new entry ids, or
+        None if check refused.
+        """
+        created_at = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if check is not None:
+                    rows = self._conn.execute(
+                        f"SELECT {ENTRY_COLUMNS} FROM entries WHERE id >= ? ORDER BY id",
+                        (since,)
+                    ).fetchall()
+                    if not check([self._entry(row) for row in rows]):
+                        self._conn.execute("ROLLBACK")
+                        return None
+                entry_ids = [
+                    self._conn.execute(
+                        "INSERT INTO entries (resource_type, resource_id, changes, created_at) VALUES (?, ?, ?, ?)",
+                        (resource_type, resource_id, json.dumps(changes), created_at)
+                    ).lastrowid
+                    for resource_type, resource_id, changes in writes
+                ]
+                self._conn.execute("COMMIT")
+                return entry_ids
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _entry(row: tuple) -> JournalEntry:
+        return JournalEntry(row[0], row[1], row[2], json.loads(row[3]), row[4])
+
+    def _rows(self, query: str, params: tuple) -> List[JournalEntry]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def pending(self, limit: int = 500, skip: Iterable[Tuple[str, str]] = ()) -> List[JournalEntry]:
+        """Oldest pending entries, leaving out the (resource_type, resource_id) pairs in skip"""
+        skip = [f"{resource_type}:{resource_id}" for resource_type, resource_id in skip]
+        exclude = f"AND resource_type || ':' || resource_id NOT IN ({', '.join('?' * len(skip))})" if skip else ""
+        return self._rows(
+            f"SELECT {ENTRY_COLUMNS} FROM entries WHERE flushed = ? {exclude} ORDER BY id LIMIT ?",
+            (PENDING, *skip, limit)
+        )
+
+    def entries_since(self, entry_id: int) -> List[JournalEntry]:
+        """All entries with id >= entry_id, oldest first"""
+        return self._rows(
+            f"SELECT {ENTRY_COLUMNS} FROM entries WHERE id >= ? ORDER BY id",
+            (entry_id,)
+        )
+
+    def replay_entries(self, head: int, fetched_at: float) -> List[JournalEntry]:
+        """
+        Entries that may be missing from a Sheets fetch that started at
+        `fetched_at`, when `head` was the newest entry: anything still
+        pending, anything newer than head, and anything flushed once the
+        fetch had started. Failed entries are never replayed.
+        """
+        return self._rows(
+            f"""
+            SELECT {ENTRY_COLUMNS} FROM entries
+            WHERE flushed != ? AND (flushed = ? OR id > ? OR flushed_at >= ?)
+            ORDER BY id
+            """,
+            (FAILED, PENDING, head, fetched_at)
+        )
+
+    def last_id(self) -> int:
+        """Id of the newest entry, or 0 if the journal is empty"""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM entries").fetchone()
+        return row[0] or 0
+
+    def mark_flushed(self, entry_ids: List[int]):
+        if not entry_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE entries SET flushed = ?, flushed_at = ? WHERE id = ?",
+                [(FLUSHED, now, i) for i in entry_ids]
+            )
+
+    def mark_failed(self, entry_ids: List[int], error: str):
+        """Dead-letter entries so they stop blocking the flusher and are never replayed"""
+        if not entry_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE entries SET flushed = ?, error = ? WHERE id = ?",
+                [(FAILED, error, i) for i in entry_ids]
+            )
+
+
+def coalesce(entries: List[JournalEntry]) -> Dict[tuple, Dict[str, Any]]:
+    """Merge entries per resource so each one needs a single Sheets write"""
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for entry in entries:
+        key = (entry.resource_type, entry.resource_id)
+        changes = merged.setdefault(key, {"entry_ids": []})
+        changes["entry_ids"].append(entry.entry_id)
+        for field, value in entry.changes.items():
+            if value is not None:
+                changes[field] = value
+    return merged
+
+
+class JournalFlusher:
+    """
+    Background worker that writes pending journal entries to Google Sheets.
+
+    Each resource backs off on its own after a failed write, so one bad row
+    does not hold up everyone else's changes, and wakeups never retry a
+    resource early. Entries for a row that no longer exists in the sheet
+    are marked failed instead of being retried forever.
+    """
+
+    def __init__(self, sheets, journal: AssignmentJournal, interval: float = 2.0, batch_size: int = 200):
+        self.sheets = sheets
+        self.journal = journal
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_backoff = 60.0
+        # (resource_type, resource_id) -> (current delay, monotonic time of the next attempt)
+        self._backoff: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def notify(self):
+        """Ask the worker to flush soon instead of waiting for the next interval"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            # Give a burst of changes a moment to coalesce
+            time.sleep(0.05)
+            self.flush_once()
+        self.flush_once()
+
+    def flush_once(self) -> bool:
+        """Write one batch of pending entries. Returns False if any write failed."""
+        now = time.monotonic()
+        waiting = [key for key, (_, retry_at) in self._backoff.items() if retry_at > now]
+        entries = self.journal.pending(self.batch_size, skip=waiting)
+        if not entries:
+            return True
+
+        ok = True
+        for key, changes in coalesce(entries).items():
+            resource_type, resource_id = key
+            try:
+                written = self._write(resource_type, resource_id, changes)
+                if not written and self._row_missing(resource_type, resource_id):
+                    print(f"{resource_type} {resource_id} is not in the sheet; dropping its journal entries")
+                    self.journal.mark_failed(changes["entry_ids"], "row not found")
+                    self._backoff.pop(key, None)
+                    continue
+            except Exception as e:
+                print(f"Error flushing {resource_type} {resource_id}: {e}")
+                written = False
+            if written:
+                self.journal.mark_flushed(changes["entry_ids"])
+                self._backoff.pop(key, None)
+            else:
+                ok = False
+                self._back_off(key)
+        return ok
+
+    def _back_off(self, key: Tuple[str, str]):
+        delay, _ = self._backoff.get(key, (self.interval / 2, 0.0))
+        delay = min(delay * 2, self.max_backoff)
+        self._backoff[key] = (delay, time.monotonic() + delay)
+        print(f"Journal flush failed for {key[0]} {key[1]}, retrying in {delay:.0f}s")
+
+    def _row_missing(self, resource_type: str, resource_id: str) -> bool:
+        if resource_type == "pilot":
+            return not self.sheets.has_pilot(resource_id)
+        if resource_type == "drone":
+            return not self.sheets.has_drone(resource_id)
+        return False
+
+    def _write(self, resource_type: str, resource_id: str, changes: Dict[str, Any]) -> bool:
+        if resource_type == "pilot":
+            available_from = changes.get("available_from")
+            return self.sheets.update_pilot_assignment(
+                resource_id,
+                changes["status"],
+                changes.get("current_assignment"),
+                datetime.strptime(available_from, "%Y-%m-%d") if available_from else None
+            )
+        if resource_type == "drone":
+            return self.sheets.update_drone_status(
+                resource_id,
+                changes["status"],
+                changes.get("current_assignment")
+            )
+        print(f"Skipping journal entry for unknown resource type {resource_type}")
+        return True
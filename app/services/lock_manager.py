@@ -0,0 +1,66 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+def pilot_key(pilot_id: str) -> str:
+    return f"pilot:{pilot_id}"
+
+
+def drone_key(drone_id: str) -> str:
+    return f"drone:{drone_id}"
+
+
+def mission_key(mission_id: str) -> str:
+    return f"mission:{mission_id}"
+
+
+class ResourceLockManager:
+    """
+    In-process locks keyed by resource (pilot, drone or mission).
+    Operations on disjoint resources never wait on each other.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[key] = lock
+            return lock
+
+    def try_acquire(self, key: str, timeout: float = 0) -> bool:
+        """Acquire the lock for a resource, giving up after timeout seconds"""
+        lock = self._lock_for(key)
+        if timeout <= 0:
+            return lock.acquire(blocking=False)
+        return lock.acquire(timeout=timeout)
+
+    def release(self, key: str):
+        self._lock_for(key).release()
+
+    @contextmanager
+    def hold(self, *keys: str, timeout: float = 10):
+        """
+        Hold several resource locks at once. Keys are taken in sorted order
+        so two callers can never deadlock. Raises TimeoutError if a lock
+        cannot be acquired in time.
+        """
+        acquired: List[str] = []
+        try:
+            for key in sorted(set(keys)):
+                if not self.try_acquire(key, timeout=timeout):
+                    raise TimeoutError(f"Resource {key} is busy, please retry")
+                acquired.append(key)
+            yield
+        finally:
+            for key in reversed(acquired):
+                self.release(key)
+
+
+# Shared by every service in the process
+lock_manager = ResourceLockManager()
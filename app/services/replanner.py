@@ -0,0 +1,289 @@
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+from app.config import get_settings
+from app.models import (
+    Pilot, Drone, Mission, PilotStatus, DroneStatus, Priority, PRIORITY_RANK, ReassignmentProposal
+)
+from app.services.assignment_service import AssignmentService
+from app.services.conflict_detector import ConflictDetector
+from app.services.lock_manager import lock_manager, pilot_key, drone_key, mission_key
+from app.services.roster_store import RosterChange, get_roster_store
+
+
+class Replanner:
+    """
+    Watches roster changes and re-plans only the missions they affect.
+
+    For every changed pilot or drone that is assigned to a mission which has
+    not ended, the assignment is re-checked. If it is no longer valid, a
+    replacement is proposed: the best free resource, or, for high and
+    critical missions with nothing free, one taken from a lower-priority
+    mission. A replacement always passes the same checks the current
+    resource failed.
+
+    Every worker detects problems and keeps proposals, but with
+    `replan_auto_apply` set only the roster leader applies them, so workers
+    sharing the journal do not all apply the same swap. Otherwise
+    proposals are applied on request.
+    """
+
+    def __init__(self, assignment_service: AssignmentService, auto_apply: Optional[bool] = None):
+        settings = get_settings()
+        self.roster = get_roster_store()
+        self.assignments = assignment_service
+        self.conflict_detector = ConflictDetector()
+        self.auto_apply = settings.replan_auto_apply if auto_apply is None else auto_apply
+
+        self._lock = threading.Lock()
+        self._proposals: Dict[Tuple[str, str], ReassignmentProposal] = {}
+        self._queue: "queue.Queue[RosterChange]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="replanner", daemon=True)
+        self._thread.start()
+        self.roster.subscribe(self._queue.put)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            # Coalesce whatever else is already queued
+            change = RosterChange(set(first.pilot_ids), set(first.drone_ids))
+            while True:
+                try:
+                    change.merge(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.handle(change)
+            except Exception as e:
+                print(f"Error re-planning after roster change: {e}")
+
+    # DETECTION
+    def handle(self, change: RosterChange) -> List[ReassignmentProposal]:
+        """Re-check the assignments of the changed resources only"""
+        now = datetime.now()
+        proposals = []
+
+        for pilot_id in change.pilot_ids:
+            pilot = self.roster.get_pilot_by_id(pilot_id)
+            mission = self._active_mission(pilot, now)
+            if mission is None:
+                continue
+            problem = self._pilot_problem(pilot, mission)
+            if problem:
+                proposals.append(self._propose(mission, "pilot", pilot.pilot_id, problem))
+            else:
+                self._discard(mission.project_id, "pilot")
+
+        for drone_id in change.drone_ids:
+            drone = self.roster.get_drone_by_id(drone_id)
+            mission = self._active_mission(drone, now)
+            if mission is None:
+                continue
+            problem = self._drone_problem(drone, mission)
+            if problem:
+                proposals.append(self._propose(mission, "drone", drone.drone_id, problem))
+            else:
+                self._discard(mission.project_id, "drone")
+
+        if self._auto_applies():
+            for proposal in proposals:
+                if proposal.replacement:
+                    self.apply(proposal.mission_id)
+        return proposals
+
+    def _auto_applies(self) -> bool:
+        return self.auto_apply and self.roster.is_leader
+
+    def _active_mission(self, resource, now: datetime) -> Optional[Mission]:
+        if resource is None or not resource.current_assignment:
+            return None
+        mission = self.roster.get_mission_by_id(resource.current_assignment)
+        if mission is None or (mission.end_date and mission.end_date < now):
+            return None
+        return mission
+
+    def _pilot_problem(self, pilot: Pilot, mission: Mission) -> Optional[str]:
+        if pilot.status == "on_leave":
+            return f"Pilot {pilot.name} is on leave"
+        # Judge fit only; being assigned to this mission is expected
+        freed = pilot.model_copy(update={"status": PilotStatus.AVAILABLE, "available_from": None})
+        check = self.conflict_detector.check_pilot_availability(freed, mission)
+        return "; ".join(check.details) if check.has_conflict else None
+
+    def _drone_problem(self, drone: Drone, mission: Mission) -> Optional[str]:
+        if drone.status == "maintenance":
+            return f"Drone {drone.drone_id} is in maintenance"
+        freed = drone.model_copy(update={"status": DroneStatus.AVAILABLE})
+        check = self.conflict_detector.check_drone_availability(freed, mission)
+        return "; ".join(check.details) if check.has_conflict else None
+
+    def _problem(self, role: str, resource, mission: Mission) -> Optional[str]:
+        if role == "pilot":
+            return self._pilot_problem(resource, mission)
+        return self._drone_problem(resource, mission)
+
+    @staticmethod
+    def _resource_id(role: str, resource) -> str:
+        return resource.pilot_id if role == "pilot" else resource.drone_id
+
+    # PROPOSALS
+    def _propose(self, mission: Mission, role: str, current: Optional[str], reason: str) -> ReassignmentProposal:
+        if role == "pilot":
+            ranked, _ = self.assignments.rank_pilots(mission)
+        else:
+            ranked, _ = self.assignments.rank_drones(mission)
+        replacement = next(
+            (
+                self._resource_id(role, resource) for resource in ranked
+                if self._resource_id(role, resource) != current
+                and not self._problem(role, resource, mission)
+            ),
+            None
+        )
+
+        preempted = None
+        if replacement is None and PRIORITY_RANK[mission.priority] >= PRIORITY_RANK[Priority.HIGH]:
+            replacement, preempted = self._find_preemption(mission, role)
+
+        proposal = ReassignmentProposal(
+            mission_id=mission.project_id,
+            priority=mission.priority,
+            role=role,
+            reason=reason,
+            current=current,
+            replacement=replacement,
+            preempted_mission=preempted
+        )
+        with self._lock:
+            self._proposals[(mission.project_id, role)] = proposal
+        return proposal
+
+    def _find_preemption(self, mission: Mission, role: str) -> Tuple[Optional[str], Optional[str]]:
+        """Suitable resource on the lowest-priority mission below this one, if any"""
+        rank = PRIORITY_RANK[mission.priority]
+        best = None
+
+        if role == "pilot":
+            resources = [p for p in self.roster.get_all_pilots() if p.status == "assigned"]
+        else:
+            resources = [d for d in self.roster.get_all_drones() if d.status == "in_use"]
+
+        for resource in resources:
+            if not resource.current_assignment or resource.current_assignment == mission.project_id:
+                continue
+            other = self.roster.get_mission_by_id(resource.current_assignment)
+            if other is None or PRIORITY_RANK[other.priority] >= rank:
+                continue
+            if self._problem(role, resource, mission):
+                continue
+            if best is None or PRIORITY_RANK[other.priority] < best[0]:
+                best = (PRIORITY_RANK[other.priority], self._resource_id(role, resource), other.project_id)
+
+        if best is None:
+            return None, None
+        return best[1], best[2]
+
+    def _discard(self, mission_id: str, role: str):
+        with self._lock:
+            self._proposals.pop((mission_id, role), None)
+
+    def get_proposals(self) -> List[ReassignmentProposal]:
+        """Open proposals, most important missions first"""
+        with self._lock:
+            proposals = list(self._proposals.values())
+        proposals.sort(key=lambda p: -PRIORITY_RANK[p.priority])
+        return proposals
+
+    # APPLY
+    def apply(self, mission_id: str) -> List[ReassignmentProposal]:
+        """Apply the open proposals for a mission; returns the ones applied"""
+        with self._lock:
+            proposals = [p for (mid, _), p in self._proposals.items() if mid == mission_id]
+
+        applied = []
+        for proposal in proposals:
+            if not proposal.replacement:
+                continue
+            if self._apply_one(proposal):
+                proposal.applied = True
+                applied.append(proposal)
+                self._discard(mission_id, proposal.role)
+                if proposal.preempted_mission:
+                    self._replan_preempted(proposal)
+        return applied
+
+    def _apply_one(self, proposal: ReassignmentProposal) -> bool:
+        key = pilot_key if proposal.role == "pilot" else drone_key
+        keys = [mission_key(proposal.mission_id), key(proposal.replacement)]
+        if proposal.current:
+            keys.append(key(proposal.current))
+
+        try:
+            with lock_manager.hold(*keys):
+                # Pick up other workers' writes before the optimistic checks
+                self.roster.sync_journal()
+                mission = self.roster.get_mission_by_id(proposal.mission_id)
+                if mission is None:
+                    return False
+                if proposal.role == "pilot":
+                    return self._swap_pilot(proposal, mission)
+                return self._swap_drone(proposal, mission)
+        except TimeoutError as e:
+            print(f"Could not apply reassignment for {proposal.mission_id}: {e}")
+            return False
+
+    def _still_usable(self, resource, proposal: ReassignmentProposal, mission: Mission) -> bool:
+        """Optimistic check that the replacement is still free and still fits"""
+        if resource is None:
+            return False
+        if proposal.preempted_mission:
+            if resource.current_assignment != proposal.preempted_mission:
+                return False
+        elif resource.status != "available":
+            return False
+        return not self._problem(proposal.role, resource, mission)
+
+    def _swap_pilot(self, proposal: ReassignmentProposal, mission: Mission) -> bool:
+        new = self.roster.get_pilot_by_id(proposal.replacement)
+        if not self._still_usable(new, proposal, mission):
+            return False
+
+        # Take the replacement first; nothing changes if another worker beat us to it
+        available_from = mission.end_date + timedelta(days=1) if mission.end_date else None
+        if not self.roster.update_pilot_assignment(
+            new.pilot_id, "assigned", mission.project_id, available_from, expected=new
+        ):
+            return False
+
+        if proposal.current:
+            old = self.roster.get_pilot_by_id(proposal.current)
+            if old is not None and old.current_assignment == mission.project_id:
+                status = "available" if old.status == "assigned" else old.status.value
+                self.roster.update_pilot_assignment(old.pilot_id, status, "", expected=old)
+        return True
+
+    def _swap_drone(self, proposal: ReassignmentProposal, mission: Mission) -> bool:
+        new = self.roster.get_drone_by_id(proposal.replacement)
+        if not self._still_usable(new, proposal, mission):
+            return False
+
+        if not self.roster.update_drone_status(new.drone_id, "in_use", mission.project_id, expected=new):
+            return False
+
+        if proposal.current:
+            old = self.roster.get_drone_by_id(proposal.current)
+            if old is not None and old.current_assignment == mission.project_id:
+                status = "available" if old.status == "in_use" else old.status.value
+                self.roster.update_drone_status(old.drone_id, status, "", expected=old)
+        return True
+
+    def _replan_preempted(self, proposal: ReassignmentProposal):
+        """The mission that gave up a resource now needs one itself"""
+        other = self.roster.get_mission_by_id(proposal.preempted_mission)
+        if other is None:
+            return
+        reason = f"{proposal.role.capitalize()} {proposal.replacement} moved to higher-priority mission {proposal.mission_id}"
+        follow_up = self._propose(other, proposal.role, None, reason)
+        if self._auto_applies() and follow_up.replacement:
+            self.apply(other.project_id)
@@ -0,0 +1,167 @@
+import json
+import os
+import struct
+import time
+from typing import List, Dict, Any, Optional, Type
+from pydantic import BaseModel
+from app.models import Pilot, Drone, Mission
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process leader election
+    fcntl = None
+
+# File layout: fixed header followed by a JSON payload of column lists
+#   magic (8s) | format (H) | base_version (Q) | journal_head (Q) | fetched_at (d) | created_at (d) | payload_len (Q)
+# journal_head and fetched_at are the newest journal entry and the time when
+# the Sheets fetch started; they decide which entries to replay on top.
+MAGIC = b"SKYROST\x00"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sHQQddQ")
+
+
+class SnapshotHeader:
+    def __init__(self, base_version: int, journal_head: int, fetched_at: float, created_at: float, payload_len: int):
+        self.base_version = base_version
+        self.journal_head = journal_head
+        self.fetched_at = fetched_at
+        self.created_at = created_at
+        self.payload_len = payload_len
+
+
+class RosterSnapshot:
+    def __init__(self, header: SnapshotHeader, pilots: List[Pilot], drones: List[Drone], missions: List[Mission]):
+        self.header = header
+        self.pilots = pilots
+        self.drones = drones
+        self.missions = missions
+
+
+def _to_columns(items: List[BaseModel]) -> Dict[str, List[Any]]:
+    """Store rows column by column so field names are written once"""
+    rows = [item.model_dump(mode="json") for item in items]
+    if not rows:
+        return {}
+    return {field: [row[field] for row in rows] for field in rows[0]}
+
+
+def _from_columns(model: Type[BaseModel], columns: Dict[str, List[Any]]) -> List[BaseModel]:
+    if not columns:
+        return []
+    fields = list(columns)
+    return [
+        model(**dict(zip(fields, values)))
+        for values in zip(*(columns[f] for f in fields))
+    ]
+
+
+def write_snapshot(
+    path: str,
+    base_version: int,
+    journal_head: int,
+    fetched_at: float,
+    pilots: List[Pilot],
+    drones: List[Drone],
+    missions: List[Mission]
+):
+    """Atomically replace the snapshot file with the given roster"""
+    payload = json.dumps({
+        "pilots": _to_columns(pilots),
+        "drones": _to_columns(drones),
+        "missions": _to_columns(missions)
+    }, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, base_version, journal_head, fetched_at, time.time(), len(payload))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _parse_header(data: bytes) -> Optional[SnapshotHeader]:
+    if len(data) < HEADER.size:
+        return None
+    magic, fmt = struct.unpack_from("<8sH", data)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return None
+    _, _, base_version, journal_head, fetched_at, created_at, payload_len = HEADER.unpack_from(data)
+    return SnapshotHeader(base_version, journal_head, fetched_at, created_at, payload_len)
+
+
+def read_snapshot_header(path: str) -> Optional[SnapshotHeader]:
+    """Read only the header; cheap enough to poll"""
+    try:
+        with open(path, "rb") as f:
+            return _parse_header(f.read(HEADER.size))
+    except FileNotFoundError:
+        return None
+
+
+def read_snapshot(path: str) -> Optional[RosterSnapshot]:
+    """
+    Read and decode a snapshot, or None if missing or unreadable. Each
+    worker builds its own roster objects from it; the file saves followers
+    the Sheets calls, not memory.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = _parse_header(f.read(HEADER.size))
+            if header is None:
+                return None
+            payload = json.loads(f.read(header.payload_len))
+    except (FileNotFoundError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Ignoring unreadable roster snapshot {path}: {e}")
+        return None
+
+    return RosterSnapshot(
+        header,
+        _from_columns(Pilot, payload.get("pilots", {})),
+        _from_columns(Drone, payload.get("drones", {})),
+        _from_columns(Mission, payload.get("missions", {}))
+    )
+
+
+class LeaderLease:
+    """
+    Exclusive file lock deciding which process syncs with Google Sheets.
+    The OS releases it when the holder exits, so another worker can take over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self.held:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None and self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
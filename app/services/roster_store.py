@@ -0,0 +1,510 @@
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Callable, Set, Tuple
+from app.config import get_settings
+from app.models import Pilot, Drone, Mission, PilotStatus, DroneStatus
+from app.services.sheets_service import SheetsService
+from app.services.journal import AssignmentJournal, JournalEntry, JournalFlusher
+from app.services.roster_snapshot import (
+    LeaderLease, RosterSnapshot, read_snapshot, read_snapshot_header, write_snapshot
+)
+
+
+class RosterChange:
+    """Ids of the pilots and drones that changed in one update"""
+
+    def __init__(self, pilot_ids: Optional[Set[str]] = None, drone_ids: Optional[Set[str]] = None):
+        self.pilot_ids = pilot_ids or set()
+        self.drone_ids = drone_ids or set()
+
+    def __bool__(self) -> bool:
+        return bool(self.pilot_ids or self.drone_ids)
+
+    def merge(self, other: "RosterChange"):
+        self.pilot_ids |= other.pilot_ids
+        self.drone_ids |= other.drone_ids
+
+
+def pilot_state(pilot: Optional[Pilot]) -> Optional[tuple]:
+    """Fields that must be unchanged for a pilot snapshot to still be valid"""
+    return (pilot.status, pilot.current_assignment, pilot.available_from) if pilot else None
+
+
+def drone_state(drone: Optional[Drone]) -> Optional[tuple]:
+    """Fields that must be unchanged for a drone snapshot to still be valid"""
+    return (drone.status, drone.current_assignment, drone.maintenance_due) if drone else None
+
+
+def _changed_ids(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+    """Ids whose value differs between two maps, ignoring newly added ones"""
+    return {key for key, value in old.items() if new.get(key) != value}
+
+
+class RosterStore:
+    """
+    In-memory copy of the pilot, drone and mission sheets.
+
+    Writes are recorded in the journal, applied here immediately and
+    flushed to Sheets in the background.
+
+    One process per host holds the leader lease. The leader refreshes from
+    Google Sheets every `roster_refresh_seconds`, writes a snapshot file after
+    each sync and runs the journal flusher. Other workers load that
+    snapshot and poll its header every `snapshot_poll_seconds`, so only the
+    leader calls the Sheets API. Every worker overlays the shared journal on
+    top of the snapshot.
+
+    `version` changes every time the roster content changes and is the same
+    in every worker once they have seen the same snapshot and journal.
+
+    Listeners registered with subscribe() are called with a RosterChange
+    after each update, outside the store's lock.
+    """
+
+    def __init__(
+        self,
+        sheets: Optional[SheetsService] = None,
+        journal: Optional[AssignmentJournal] = None,
+        snapshot_path: Optional[str] = None
+    ):
+        settings = get_settings()
+        self._sheets = sheets
+        self.journal = journal or AssignmentJournal(settings.journal_path)
+        self.snapshot_path = snapshot_path or settings.roster_snapshot_path
+        self.lease = LeaderLease(f"{self.snapshot_path}.lock")
+        self.refresh_seconds = settings.roster_refresh_seconds
+        self.poll_seconds = settings.snapshot_poll_seconds
+        self.flush_seconds = settings.journal_flush_seconds
+        self.flush_batch_size = settings.journal_batch_size
+        self.flusher: Optional[JournalFlusher] = None
+
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._started = False
+        # Roster as last read from Sheets/snapshot, before journal entries
+        self._base: Optional[tuple] = None
+        self._base_version = 0
+        self._journal_head = 0
+        self._pilots: Dict[str, Pilot] = {}
+        self._drones: Dict[str, Drone] = {}
+        self._missions: Dict[str, Mission] = {}
+        self._loaded_at: Optional[float] = None
+        self._listeners: List[Callable[[RosterChange], None]] = []
+
+    @property
+    def sheets(self) -> SheetsService:
+        # Followers never need a Sheets connection
+        if self._sheets is None:
+            self._sheets = SheetsService()
+        return self._sheets
+
+    @property
+    def version(self) -> str:
+        # Both parts, not their sum: two workers can be at different base
+        # and journal positions whose sums happen to match
+        return f"{self._base_version}-{self._journal_head}"
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lease.held
+
+    def subscribe(self, listener: Callable[[RosterChange], None]):
+        """Call listener with the changed pilot and drone ids after every update"""
+        self._listeners.append(listener)
+
+    def _notify(self, change: RosterChange):
+        if not change:
+            return
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Error in roster listener: {e}")
+
+    # SYNC
+    def refresh(self, force: bool = False):
+        """
+        Bring the roster up to date from Sheets (leader) or the snapshot
+        (followers). Once loaded, stale data is refreshed on a background
+        thread and the current data keeps being served meanwhile; only the
+        first load and forced refreshes block.
+        """
+        if force or self._loaded_at is None:
+            with self._refresh_lock:
+                if force or self._loaded_at is None:
+                    self._refresh_locked()
+        elif self._is_stale():
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # already refreshing
+
+        def run():
+            try:
+                if self._is_stale():
+                    self._refresh_locked()
+            except Exception as e:
+                print(f"Background roster refresh failed: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=run, name="roster-refresh", daemon=True).start()
+
+    def _refresh_locked(self):
+        if not self.is_leader and self.lease.try_acquire():
+            self._become_leader()
+        if self.is_leader or not self._sync_from_snapshot():
+            self._sync_from_sheets()
+        self.sync_journal()
+
+    def _is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        interval = self.refresh_seconds if self.is_leader else self.poll_seconds
+        return time.monotonic() - self._loaded_at > interval
+
+    def _sync_from_sheets(self):
+        # Entries after this head, or flushed after this time, may or may not
+        # be in what we fetch, so they are re-applied on top of it
+        journal_head = self.journal.last_id()
+        fetched_at = time.time()
+        try:
+            pilots = self.sheets.get_all_pilots()
+            drones = self.sheets.get_all_drones()
+            missions = self.sheets.get_all_missions()
+        except Exception as e:
+            if self._loaded_at is None:
+                raise
+            print(f"Roster refresh failed, serving cached data: {e}")
+            self._loaded_at = time.monotonic()
+            return
+
+        base_version = self._base_version
+        if (pilots, drones, missions) != self._base:
+            base_version += 1
+        self._install(pilots, drones, missions, journal_head, fetched_at, base_version)
+
+        if self.is_leader:
+            try:
+                write_snapshot(self.snapshot_path, base_version, journal_head, fetched_at, pilots, drones, missions)
+            except OSError as e:
+                print(f"Error writing roster snapshot: {e}")
+
+    def _sync_from_snapshot(self) -> bool:
+        """Load the leader's snapshot if it changed. Returns False if there is none."""
+        header = read_snapshot_header(self.snapshot_path)
+        if header is None or not self._usable(header):
+            return False
+        if header.base_version != self._base_version or self._base is None:
+            snapshot = read_snapshot(self.snapshot_path)
+            if snapshot is None:
+                return False
+            self._install_snapshot(snapshot)
+        self._loaded_at = time.monotonic()
+        return True
+
+    def _usable(self, header) -> bool:
+        """A snapshot pointing past the end of the journal belongs to a journal that was reset"""
+        if header.journal_head > self.journal.last_id():
+            print(f"Ignoring roster snapshot {self.snapshot_path}: it does not match the journal")
+            return False
+        return True
+
+    def _install_snapshot(self, snapshot: RosterSnapshot):
+        header = snapshot.header
+        self._install(
+            snapshot.pilots, snapshot.drones, snapshot.missions,
+            header.journal_head, header.fetched_at, header.base_version
+        )
+
+    def _install(
+        self,
+        pilots: List[Pilot],
+        drones: List[Drone],
+        missions: List[Mission],
+        journal_head: int,
+        fetched_at: float,
+        base_version: int
+    ):
+        """Replace the roster with a new base plus the journal entries it may be missing"""
+        new_pilots = {p.pilot_id: p for p in pilots}
+        new_drones = {d.drone_id: d for d in drones}
+        new_missions = {m.project_id: m for m in missions}
+        head = journal_head
+        for entry in self.journal.replay_entries(journal_head, fetched_at):
+            self._apply(entry, new_pilots, new_drones)
+            head = max(head, entry.entry_id)
+
+        with self._lock:
+            old_pilots, old_drones = self._pilots, self._drones
+            self._base = (pilots, drones, missions)
+            self._pilots, self._drones, self._missions = new_pilots, new_drones, new_missions
+            self._base_version = base_version
+            # Entries recorded while we replayed only reached the old maps;
+            # catch the new ones up from their own head before anyone reads them
+            self._journal_head = head
+            change = self._sync_journal_locked()
+            change.merge(RosterChange(
+                _changed_ids(old_pilots, self._pilots),
+                _changed_ids(old_drones, self._drones)
+            ))
+            self._loaded_at = time.monotonic()
+        self._notify(change)
+
+    def sync_journal(self):
+        """Apply journal entries written since the last sync, including other workers' writes"""
+        with self._lock:
+            change = self._sync_journal_locked()
+        self._notify(change)
+
+    def _sync_journal_locked(self) -> RosterChange:
+        return self._apply_entries(self.journal.entries_since(self._journal_head + 1))
+
+    def _apply_entries(self, entries: List[JournalEntry]) -> RosterChange:
+        change = RosterChange()
+        for entry in entries:
+            if entry.entry_id <= self._journal_head:
+                continue
+            self._apply(entry, self._pilots, self._drones)
+            self._journal_head = entry.entry_id
+            if entry.resource_type == "pilot":
+                change.pilot_ids.add(entry.resource_id)
+            else:
+                change.drone_ids.add(entry.resource_id)
+        return change
+
+    def _apply(self, entry: JournalEntry, pilots: Dict[str, Pilot], drones: Dict[str, Drone]):
+        """Apply one journal entry to the given roster maps"""
+        changes = {k: v for k, v in entry.changes.items() if v is not None}
+        # An empty assignment clears it, as an empty cell does in the sheet
+        if changes.get("current_assignment") == "":
+            changes["current_assignment"] = None
+        if entry.resource_type == "pilot" and entry.resource_id in pilots:
+            if "status" in changes:
+                changes["status"] = PilotStatus(changes["status"])
+            if "available_from" in changes:
+                changes["available_from"] = datetime.strptime(changes["available_from"], "%Y-%m-%d")
+            pilots[entry.resource_id] = pilots[entry.resource_id].model_copy(update=changes)
+        elif entry.resource_type == "drone" and entry.resource_id in drones:
+            if "status" in changes:
+                changes["status"] = DroneStatus(changes["status"])
+            drones[entry.resource_id] = drones[entry.resource_id].model_copy(update=changes)
+
+    def _record(
+        self,
+        writes: List[Tuple[str, str, Dict[str, Any]]],
+        check: Optional[Callable[[], bool]] = None
+    ) -> bool:
+        """
+        Journal (resource_type, resource_id, changes) writes, apply them in
+        memory and wake the flusher.
+
+        With check, every other worker's newer entries are applied first and
+        the writes are only recorded if check() still holds. Both happen in
+        one journal transaction, so the check is atomic across workers.
+        Returns False if a resource is unknown or check() failed.
+        """
+        with self._lock:
+            for resource_type, resource_id, _ in writes:
+                known = self._pilots if resource_type == "pilot" else self._drones
+                if resource_id not in known:
+                    return False
+
+            change = RosterChange()
+
+            def verify(entries: List[JournalEntry]) -> bool:
+                change.merge(self._apply_entries(entries))
+                return check is None or check()
+
+            entry_ids = self.journal.append_if(writes, self._journal_head + 1, verify)
+            change.merge(self._sync_journal_locked())
+        self._notify(change)
+        if entry_ids is None:
+            return False
+        if self.flusher is not None:
+            self.flusher.notify()
+        return True
+
+    @staticmethod
+    def _pilot_changes(status: str, assignment: Optional[str], available_from: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        try:
+            status = PilotStatus(status).value
+        except ValueError:
+            print(f"Invalid pilot status: {status}")
+            return None
+        return {
+            "status": status,
+            "current_assignment": assignment,
+            "available_from": available_from.strftime('%Y-%m-%d') if available_from else None
+        }
+
+    @staticmethod
+    def _drone_changes(status: str, assignment: Optional[str]) -> Optional[Dict[str, Any]]:
+        try:
+            status = DroneStatus(status).value
+        except ValueError:
+            print(f"Invalid drone status: {status}")
+            return None
+        return {"status": status, "current_assignment": assignment}
+
+    def _unchanged(self, pilot: Optional[Pilot] = None, drone: Optional[Drone] = None) -> bool:
+        """Whether the given snapshots still match the roster; call with the lock held"""
+        if pilot is not None and pilot_state(self._pilots.get(pilot.pilot_id)) != pilot_state(pilot):
+            return False
+        if drone is not None and drone_state(self._drones.get(drone.drone_id)) != drone_state(drone):
+            return False
+        return True
+
+    def _become_leader(self):
+        print("Roster store is now the leader; syncing with Google Sheets")
+        if self._started and self.flusher is None:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        self.flusher = JournalFlusher(
+            self.sheets,
+            self.journal,
+            interval=self.flush_seconds,
+            batch_size=self.flush_batch_size
+        )
+        self.flusher.start()
+
+    def start(self):
+        """
+        Load the roster, replaying any unflushed journal entries. A snapshot
+        left by a previous run or another worker is used straight away.
+        """
+        self.lease.try_acquire()
+        snapshot = read_snapshot(self.snapshot_path)
+        if snapshot is not None and self._usable(snapshot.header):
+            self._install_snapshot(snapshot)
+            # Age the load so a leader re-syncs once the snapshot is due
+            age = max(0.0, time.time() - snapshot.header.created_at)
+            self._loaded_at = time.monotonic() - age
+        else:
+            self.refresh(force=True)
+        self._started = True
+        if self.is_leader:
+            self._start_flusher()
+
+    def close(self):
+        if self.flusher is not None:
+            self.flusher.stop()
+            self.flusher = None
+        self.lease.release()
+
+    # PILOTS
+    def get_all_pilots(self) -> List[Pilot]:
+        self.refresh()
+        with self._lock:
+            return list(self._pilots.values())
+
+    def get_pilot_by_id(self, pilot_id: str) -> Optional[Pilot]:
+        self.refresh()
+        return self._pilots.get(pilot_id)
+
+    def update_pilot_assignment(
+        self,
+        pilot_id: str,
+        status: str,
+        assignment: Optional[str] = None,
+        available_from: Optional[datetime] = None,
+        expected: Optional[Pilot] = None
+    ) -> bool:
+        """
+        Record a pilot status/assignment change. With expected, only if the
+        pilot is still as in that snapshot, in every worker.
+        """
+        changes = self._pilot_changes(status, assignment, available_from)
+        if changes is None:
+            return False
+        self.refresh()
+        check = (lambda: self._unchanged(pilot=expected)) if expected else None
+        return self._record([("pilot", pilot_id, changes)], check)
+
+    def update_pilot_status(self, pilot_id: str, status: str) -> bool:
+        """Record a pilot status change"""
+        return self.update_pilot_assignment(pilot_id, status)
+
+    # DRONES
+    def get_all_drones(self) -> List[Drone]:
+        self.refresh()
+        with self._lock:
+            return list(self._drones.values())
+
+    def get_drone_by_id(self, drone_id: str) -> Optional[Drone]:
+        self.refresh()
+        return self._drones.get(drone_id)
+
+    def update_drone_status(
+        self,
+        drone_id: str,
+        status: str,
+        assignment: Optional[str] = None,
+        expected: Optional[Drone] = None
+    ) -> bool:
+        """
+        Record a drone status/assignment change. With expected, only if the
+        drone is still as in that snapshot, in every worker.
+        """
+        changes = self._drone_changes(status, assignment)
+        if changes is None:
+            return False
+        self.refresh()
+        check = (lambda: self._unchanged(drone=expected)) if expected else None
+        return self._record([("drone", drone_id, changes)], check)
+
+    # ASSIGNMENTS
+    def record_assignment(
+        self,
+        pilot: Pilot,
+        drone: Drone,
+        mission_id: str,
+        available_from: Optional[datetime] = None
+    ) -> bool:
+        """
+        Assign a pilot and drone to a mission in one journal transaction,
+        only if neither has changed since the given snapshots were read and
+        nothing else is assigned to the mission yet. Returns False if
+        another worker got there first.
+        """
+        self.refresh()
+        return self._record(
+            [
+                ("pilot", pilot.pilot_id, self._pilot_changes("assigned", mission_id, available_from)),
+                ("drone", drone.drone_id, self._drone_changes("in_use", mission_id))
+            ],
+            lambda: self._unchanged(pilot=pilot, drone=drone) and not any(self._staff_locked(mission_id))
+        )
+
+    # MISSIONS
+    def get_all_missions(self) -> List[Mission]:
+        self.refresh()
+        with self._lock:
+            return list(self._missions.values())
+
+    def get_mission_by_id(self, project_id: str) -> Optional[Mission]:
+        self.refresh()
+        return self._missions.get(project_id)
+
+    def get_mission_staff(self, project_id: str) -> Tuple[List[Pilot], List[Drone]]:
+        """Pilots and drones currently assigned to a mission"""
+        self.refresh()
+        with self._lock:
+            return self._staff_locked(project_id)
+
+    def _staff_locked(self, project_id: str) -> Tuple[List[Pilot], List[Drone]]:
+        return (
+            [p for p in self._pilots.values() if p.current_assignment == project_id],
+            [d for d in self._drones.values() if d.current_assignment == project_id]
+        )
+
+
+@lru_cache()
+def get_roster_store() -> RosterStore:
+    store = RosterStore()
+    store.start()
+    return store
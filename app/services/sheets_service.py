@@ -72,6 +72,21 @@ class SheetsService:
                 continue
         
         return pilots
+
+    def get_pilot_by_id(self, pilot_id: str) -> Optional[Pilot]:
+        """Get specific pilot by ID"""
+        for pilot in self.get_all_pilots():
+            if pilot.pilot_id == pilot_id:
+                return pilot
+        return None
+
+    def has_pilot(self, pilot_id: str) -> bool:
+        """Whether the pilot has a row in the sheet; raises on API errors"""
+        return self.pilot_sheet.find(pilot_id) is not None
+
+    def update_pilot_status(self, pilot_id: str, status: str) -> bool:
+        """Update only the pilot's status in Google Sheets"""
+        return self.update_pilot_assignment(pilot_id, status)
     
     def update_pilot_assignment(
         self, 
@@ -121,7 +136,18 @@ class SheetsService:
                 continue
         
         return drones
+
+    def get_drone_by_id(self, drone_id: str) -> Optional[Drone]:
+        """Get specific drone by ID"""
+        for drone in self.get_all_drones():
+            if drone.drone_id == drone_id:
+                return drone
+        return None
     
+    def has_drone(self, drone_id: str) -> bool:
+        """Whether the drone has a row in the sheet; raises on API errors"""
+        return self.drone_sheet.find(drone_id) is not None
+
     def update_drone_status(self, drone_id: str, status: str, assignment: Optional[str] = None) -> bool:
         """Update drone status in Google Sheets"""
         try:
@@ -0,0 +1,108 @@
+import threading
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+from app.models import Pilot, Drone, Mission, MissionSuitability, PRIORITY_RANK
+from app.services.roster_store import get_roster_store
+from app.services.assignment_service import score_pilot, score_drone
+
+
+class SuitabilityService:
+    """
+    Mission x pilot and mission x drone suitability for every open mission,
+    computed from one roster snapshot and cached until the roster version
+    changes.
+
+    The rules match ConflictDetector: the resource must be available and in
+    the mission's location. Pilots must be free by the start date and hold
+    every required skill and certification; drones must not fall due for
+    maintenance before the mission ends.
+    """
+
+    def __init__(self, top_n: int = 3):
+        self.roster = get_roster_store()
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._cached_version: Optional[str] = None
+        self._cached: List[MissionSuitability] = []
+
+    def get_matrix(self) -> List[MissionSuitability]:
+        """Suitability of every open mission, most urgent first"""
+        self.roster.refresh()
+        with self._lock:
+            if self._cached_version != self.roster.version:
+                version = self.roster.version
+                self._cached = self._compute(
+                    self.roster.get_all_pilots(),
+                    self.roster.get_all_drones(),
+                    self.roster.get_all_missions()
+                )
+                self._cached_version = version
+            return self._cached
+
+    def get_mission(self, mission_id: str) -> Optional[MissionSuitability]:
+        for row in self.get_matrix():
+            if row.mission_id == mission_id:
+                return row
+        return None
+
+    def _compute(
+        self,
+        pilots: List[Pilot],
+        drones: List[Drone],
+        missions: List[Mission]
+    ) -> List[MissionSuitability]:
+        # Missions that already have a pilot are not open
+        assigned = {p.current_assignment for p in pilots if p.current_assignment}
+
+        # Bucket available resources by location once, instead of checking
+        # every resource against every mission
+        pilots_by_location: Dict[str, List[Tuple[Pilot, set, set]]] = defaultdict(list)
+        for pilot in pilots:
+            if pilot.status == "available":
+                pilots_by_location[pilot.location].append(
+                    (pilot, set(pilot.skills), set(pilot.certifications))
+                )
+        drones_by_location: Dict[str, List[Drone]] = defaultdict(list)
+        for drone in drones:
+            if drone.status == "available":
+                drones_by_location[drone.location].append(drone)
+
+        rows = []
+        for mission in missions:
+            if mission.project_id in assigned:
+                continue
+            skills = set(mission.required_skills)
+            certs = set(mission.required_certs)
+
+            pilot_candidates = []
+            for pilot, pilot_skills, pilot_certs in pilots_by_location.get(mission.location, []):
+                if pilot.available_from and mission.start_date and pilot.available_from > mission.start_date:
+                    continue
+                if skills <= pilot_skills and certs <= pilot_certs:
+                    pilot_candidates.append((pilot, score_pilot(pilot, mission)))
+
+            mission_end = mission.end_date or mission.start_date
+            drone_candidates = []
+            for drone in drones_by_location.get(mission.location, []):
+                if drone.maintenance_due and mission_end and drone.maintenance_due <= mission_end:
+                    continue
+                drone_candidates.append((drone, score_drone(drone, mission)))
+
+            pilot_candidates.sort(key=lambda x: x[1], reverse=True)
+            drone_candidates.sort(key=lambda x: x[1], reverse=True)
+
+            rows.append(MissionSuitability(
+                mission_id=mission.project_id,
+                client=mission.client,
+                location=mission.location,
+                priority=mission.priority,
+                start_date=mission.start_date,
+                end_date=mission.end_date,
+                pilot_count=len(pilot_candidates),
+                drone_count=len(drone_candidates),
+                best_pilots=[p.pilot_id for p, _ in pilot_candidates[:self.top_n]],
+                best_drones=[d.drone_id for d, _ in drone_candidates[:self.top_n]]
+            ))
+
+        rows.sort(key=lambda r: (-PRIORITY_RANK[r.priority], r.start_date))
+        return rows
@@ -1,14 +1,22 @@
 from typing import List, Dict, Any, Optional
-from app.services.sheets_service import SheetsService
+from datetime import datetime
+from app.services.roster_store import get_roster_store
 from app.services.assignment_service import AssignmentService
 from app.services.conflict_detector import ConflictDetector
+from app.services.suitability import SuitabilityService
+from app.services.availability_index import AvailabilityIndex
+from app.services.replanner import Replanner
+from app.services.lock_manager import lock_manager, pilot_key
 
 class ToolExecutor:
     def __init__(self):
         # Initialize services
-        self.sheets = SheetsService()
+        self.roster = get_roster_store()
         self.assignment_service = AssignmentService()
         self.conflict_detector = ConflictDetector()
+        self.suitability = SuitabilityService()
+        self.availability = AvailabilityIndex()
+        self.replanner = Replanner(self.assignment_service)
 
     def get_available_pilots(self, skills: Optional[List[str]] = None, location: Optional[str] = None) -> str:
         """
@@ -18,7 +26,7 @@ class ToolExecutor:
             skills: Required skills (e.g., ['commercial', 'night_flying'])
             location: Required location
         """
-        pilots = self.sheets.get_all_pilots()
+        pilots = self.roster.get_all_pilots()
         
         # Filter by skills if provided
         if skills:
@@ -52,7 +60,7 @@ class ToolExecutor:
             capabilities: Required drone capabilities
             location: Required location
         """
-        drones = self.sheets.get_all_drones()
+        drones = self.roster.get_all_drones()
         
         # Filter by capabilities if provided
         if capabilities:
@@ -77,6 +85,49 @@ class ToolExecutor:
         
         return result
 
+    def find_available_resources(
+        self,
+        start_date: str,
+        end_date: str,
+        location: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        capabilities: Optional[List[str]] = None
+    ) -> str:
+        """
+        Find pilots and drones free for a whole date window, optionally filtered.
+        
+        Args:
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+            location: Required location
+            skills: Required pilot skills
+            capabilities: Required drone capabilities
+        """
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            end = datetime.strptime(end_date, "%Y-%m-%d")
+            found = self.availability.search(start, end, location, skills, capabilities=capabilities)
+        except ValueError as e:
+            return f"❌ Invalid date window: {e}"
+        
+        where = f" in {location}" if location else ""
+        result = f"Free from {start_date} to {end_date}{where}:\n"
+        
+        result += "\nPilots:\n"
+        if not found.pilots:
+            result += "- None\n"
+        for p in found.pilots:
+            result += f"- {p.name} (ID: {p.pilot_id}) - {p.location}, skills: {', '.join(p.skills)}\n"
+        
+        result += "\nDrones:\n"
+        if not found.drones:
+            result += "- None\n"
+        for d in found.drones:
+            due = d.maintenance_due.strftime('%Y-%m-%d') if d.maintenance_due else "N/A"
+            result += f"- {d.model} (ID: {d.drone_id}) - {d.location}, maintenance due {due}\n"
+        
+        return result
+
     def assign_pilot_to_mission(self, mission_id: str) -> str:
         """
         Assign a pilot and drone to a mission with conflict detection.
@@ -99,13 +150,13 @@ class ToolExecutor:
         Args:
             mission_id: Mission ID to check
         """
-        mission = self.sheets.get_mission_by_id(mission_id)
+        mission = self.roster.get_mission_by_id(mission_id)
         
         if not mission:
             return f"Mission {mission_id} not found"
         
-        pilots = self.sheets.get_all_pilots()
-        drones = self.sheets.get_all_drones()
+        pilots = self.roster.get_all_pilots()
+        drones = self.roster.get_all_drones()
         
         conflicts = []
         
@@ -121,6 +172,36 @@ class ToolExecutor:
         
         return "\n".join(conflicts) if conflicts else "No suitable resources found"
 
+    def get_fleet_readiness(self, only_unstaffed: bool = False) -> str:
+        """
+        Readiness report for all open (unassigned) missions: how many pilots and
+        drones are suitable for each one, and the best candidates.
+        
+        Args:
+            only_unstaffed: Only list missions with no suitable pilot or drone
+        """
+        rows = self.suitability.get_matrix()
+        
+        if only_unstaffed:
+            rows = [r for r in rows if r.pilot_count == 0 or r.drone_count == 0]
+        
+        if not rows:
+            return "No open missions found matching criteria"
+        
+        result = "Fleet Readiness:\n"
+        for r in rows:
+            marker = "✅" if r.pilot_count and r.drone_count else "❌"
+            result += f"\n{marker} {r.client} (ID: {r.mission_id}) - {r.priority.value}, {r.location}, starts {r.start_date.strftime('%Y-%m-%d')}\n"
+            result += f"  Suitable pilots: {r.pilot_count}"
+            if r.best_pilots:
+                result += f" (best: {', '.join(r.best_pilots)})"
+            result += f"\n  Suitable drones: {r.drone_count}"
+            if r.best_drones:
+                result += f" (best: {', '.join(r.best_drones)})"
+            result += "\n"
+        
+        return result
+
     def update_pilot_status(self, pilot_id: str, status: str) -> str:
         """
         Update a pilot's status (available, assigned, on_leave, training).
@@ -129,16 +210,61 @@ class ToolExecutor:
             pilot_id: Pilot ID
             status: New status (available, assigned, on_leave, training)
         """
-        success = self.sheets.update_pilot_status(pilot_id, status)
+        try:
+            # Don't race an assignment that is writing the same pilot
+            with lock_manager.hold(pilot_key(pilot_id)):
+                success = self.roster.update_pilot_status(pilot_id, status)
+        except TimeoutError as e:
+            return f"❌ {e}"
         
         if success:
             return f"✅ Updated pilot {pilot_id} status to {status}"
         else:
             return f"❌ Failed to update pilot {pilot_id}"
 
+    def get_reassignment_proposals(self) -> str:
+        """Missions whose pilot or drone became unusable after a roster change, with proposed replacements."""
+        proposals = self.replanner.get_proposals()
+        
+        if not proposals:
+            return "No assignments need re-planning"
+        
+        result = "Re-planning Proposals:\n"
+        for p in proposals:
+            result += f"\n- Mission {p.mission_id} ({p.priority.value}) - {p.role}\n"
+            result += f"  Problem: {p.reason}\n"
+            if p.replacement:
+                result += f"  Replace {p.current or 'nobody'} with {p.replacement}"
+                if p.preempted_mission:
+                    result += f" (taken from lower-priority mission {p.preempted_mission})"
+                result += "\n"
+            else:
+                result += "  No replacement available\n"
+        
+        return result
+
+    def apply_reassignment(self, mission_id: str) -> str:
+        """
+        Apply the proposed re-planning for a mission.
+        
+        Args:
+            mission_id: Mission ID whose proposals should be applied
+        """
+        applied = self.replanner.apply(mission_id)
+        
+        if not applied:
+            return f"❌ No applicable proposals for mission {mission_id}"
+        
+        result = ""
+        for p in applied:
+            result += f"✅ Mission {mission_id}: {p.role} {p.current or '-'} replaced by {p.replacement}\n"
+            if p.preempted_mission:
+                result += f"  Mission {p.preempted_mission} now needs a new {p.role}\n"
+        return result
+
     def get_all_missions(self) -> str:
         """Get all current missions."""
-        missions = self.sheets.get_all_missions()
+        missions = self.roster.get_all_missions()
         
         if not missions:
             return "No missions found"
@@ -165,8 +291,20 @@ executor = ToolExecutor()
 TOOLS = [
     executor.get_available_pilots,
     executor.get_available_drones,
+    executor.find_available_resources,
     executor.assign_pilot_to_mission,
     executor.check_mission_conflicts,
+    executor.get_fleet_readiness,
     executor.update_pilot_status,
+    executor.get_reassignment_proposals,
+    executor.apply_reassignment,
     executor.get_all_missions
-]
\ No newline at end of file
+]
+
+# Tools that modify the roster. The agent runs these one at a time;
+# everything else is read-only and may run concurrently.
+WRITE_TOOLS = {
+    "assign_pilot_to_mission",
+    "update_pilot_status",
+    "apply_reassignment"
+}
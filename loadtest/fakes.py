@@ -0,0 +1,282 @@
+"""
+Local stand-ins for Google Sheets and Gemini.
+
+install() patches the gspread/google-genai entry points the app uses, so it
+must run before anything under `app` is imported.
+"""
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+import requests
+from gspread.exceptions import APIError
+from google.genai import types
+
+LOCATIONS = ["Mumbai", "Pune", "Bangalore", "Delhi", "Chennai"]
+SKILLS = ["mapping", "survey", "inspection", "thermal", "night_flying", "photography"]
+CERTS = ["DGCA", "night_ops", "BVLOS"]
+CAPABILITIES = ["rgb", "thermal", "lidar", "multispectral"]
+PRIORITIES = ["low", "medium", "high", "critical"]
+
+
+class FakeSheetsBackend:
+    """Shared latency and failure settings for every fake worksheet"""
+
+    def __init__(self, latency: float = 0.0, rate_limit_probability: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.rate_limit_probability = rate_limit_probability
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    def call(self, may_throttle: bool = True):
+        """Simulate one Sheets API round-trip"""
+        with self._lock:
+            self.calls += 1
+            throttle = may_throttle and self._random.random() < self.rate_limit_probability
+            if throttle:
+                self.rate_limited += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            response = requests.Response()
+            response.status_code = 429
+            response._content = json.dumps({"error": {
+                "code": 429,
+                "message": "Quota exceeded for quota metric 'Read requests'",
+                "status": "RESOURCE_EXHAUSTED"
+            }}).encode("utf-8")
+            raise APIError(response)
+
+
+class FakeCell:
+    def __init__(self, row: int, col: int, value: str):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+class FakeWorksheet:
+    """The subset of gspread.Worksheet used by SheetsService"""
+
+    def __init__(self, backend: FakeSheetsBackend, header: List[str], rows: List[Dict[str, Any]]):
+        self.backend = backend
+        self.header = header
+        self.rows = rows
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        # The app cannot start without its first roster load, so 429s are
+        # only injected once each sheet has been read
+        self.backend.call(may_throttle=self._loaded)
+        self._loaded = True
+        with self._lock:
+            return [dict(row) for row in self.rows]
+
+    def find(self, query: str) -> Optional[FakeCell]:
+        self.backend.call()
+        with self._lock:
+            for index, row in enumerate(self.rows):
+                for col, field in enumerate(self.header):
+                    if str(row.get(field, "")) == str(query):
+                        # Row 1 is the header
+                        return FakeCell(index + 2, col + 1, query)
+        return None
+
+    def update_cell(self, row: int, col: int, value: Any):
+        self.backend.call()
+        with self._lock:
+            self.rows[row - 2][self.header[col - 1]] = value
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet: FakeWorksheet):
+        self.sheet1 = worksheet
+
+
+class FakeSheetsClient:
+    """Returned from the patched gspread.authorize"""
+
+    def __init__(self, sheets: Dict[str, FakeWorksheet]):
+        self.sheets = sheets
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        return FakeSpreadsheet(self.sheets[key])
+
+
+def generate_fleet(
+    backend: FakeSheetsBackend,
+    pilots: int = 60,
+    drones: int = 60,
+    missions: int = 120,
+    seed: int = 0
+) -> Dict[str, FakeWorksheet]:
+    """Deterministic synthetic roster, keyed by the fake sheet ids used in install()"""
+    rnd = random.Random(seed)
+    today = datetime(2026, 11, 1)
+
+    pilot_rows = []
+    for i in range(pilots):
+        status = rnd.choices(["available", "assigned", "on_leave"], weights=[6, 3, 1])[0]
+        pilot_rows.append({
+            "pilot_id": f"P{i:03d}",
+            "name": f"Pilot {i}",
+            "skills": ", ".join(rnd.sample(SKILLS, 3)),
+            "certifications": ", ".join(rnd.sample(CERTS, 2)),
+            "location": rnd.choice(LOCATIONS),
+            "status": status,
+            "current_assignment": "",
+            "available_from": (today + timedelta(days=rnd.randint(0, 20))).strftime("%Y-%m-%d") if status == "assigned" else ""
+        })
+
+    drone_rows = []
+    for i in range(drones):
+        drone_rows.append({
+            "drone_id": f"D{i:03d}",
+            "model": rnd.choice(["DJI M300", "DJI Mavic 3", "Skylark X1"]),
+            "capabilities": ", ".join(rnd.sample(CAPABILITIES, 2)),
+            "status": rnd.choices(["available", "in_use", "maintenance"], weights=[6, 3, 1])[0],
+            "location": rnd.choice(LOCATIONS),
+            "current_assignment": "",
+            "maintenance_due": (today + timedelta(days=rnd.randint(1, 90))).strftime("%Y-%m-%d")
+        })
+
+    mission_rows = []
+    for i in range(missions):
+        start = today + timedelta(days=rnd.randint(0, 30))
+        mission_rows.append({
+            "project_id": f"M{i:03d}",
+            "client": f"Client {i % 17}",
+            "location": rnd.choice(LOCATIONS),
+            "required_skills": ", ".join(rnd.sample(SKILLS, 1)),
+            "required_certs": rnd.choice(CERTS),
+            "start_date": start.strftime("%Y-%m-%d"),
+            "end_date": (start + timedelta(days=rnd.randint(1, 5))).strftime("%Y-%m-%d"),
+            "priority": rnd.choice(PRIORITIES)
+        })
+
+    def sheet(rows):
+        return FakeWorksheet(backend, list(rows[0].keys()), rows)
+
+    return {
+        "fake-pilots": sheet(pilot_rows),
+        "fake-drones": sheet(drone_rows),
+        "fake-missions": sheet(mission_rows)
+    }
+
+
+# LLM
+class FakeResponse:
+    def __init__(self, text: Optional[str] = None, function_calls: Optional[List[types.FunctionCall]] = None):
+        self.text = text
+        self.function_calls = function_calls or None
+
+
+class FakeChat:
+    """
+    Scripted chat session. User messages are mapped to function calls by
+    keyword; a turn of function responses is answered with text.
+    """
+
+    MISSION_ID = re.compile(r"\bM\d+\b")
+    PILOT_ID = re.compile(r"\bP\d+\b")
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.history: List[Any] = []
+
+    def send_message(self, message) -> FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        self.history.append(message)
+        if isinstance(message, str):
+            return self._plan(message)
+        names = [part.function_response.name for part in message]
+        return FakeResponse(text=f"Done. Ran {len(names)} tool(s): {', '.join(names)}")
+
+    def _call(self, name: str, **args) -> types.FunctionCall:
+        return types.FunctionCall(name=name, args=args)
+
+    def _plan(self, message: str) -> FakeResponse:
+        text = message.lower()
+        missions = self.MISSION_ID.findall(message)
+        pilots = self.PILOT_ID.findall(message)
+
+        if "assign" in text and missions:
+            return FakeResponse(function_calls=[self._call("assign_pilot_to_mission", mission_id=missions[0])])
+        if "leave" in text and pilots:
+            return FakeResponse(function_calls=[self._call("update_pilot_status", pilot_id=pilots[0], status="on_leave")])
+        if "conflict" in text and missions:
+            return FakeResponse(function_calls=[self._call("check_mission_conflicts", mission_id=m) for m in missions])
+        if "readiness" in text:
+            return FakeResponse(function_calls=[self._call("get_fleet_readiness")])
+        if "free" in text:
+            return FakeResponse(function_calls=[self._call(
+                "find_available_resources", start_date="2026-11-03", end_date="2026-11-07", location="Mumbai"
+            )])
+        if "fleet" in text:
+            return FakeResponse(function_calls=[
+                self._call("get_available_pilots"),
+                self._call("get_available_drones"),
+                self._call("get_all_missions")
+            ])
+        return FakeResponse(text="I can help with pilots, drones and missions.")
+
+
+class FakeChats:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create(self, model: str, config: Any = None) -> FakeChat:
+        return FakeChat(self.latency)
+
+
+class FakeGenaiClient:
+    latency = 0.0
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        self.chats = FakeChats(self.latency)
+
+
+def install(
+    sheets_latency: float = 0.0,
+    rate_limit_probability: float = 0.0,
+    llm_latency: float = 0.0,
+    pilots: int = 60,
+    drones: int = 60,
+    missions: int = 120,
+    seed: int = 0,
+    data_dir: Optional[str] = None
+) -> FakeSheetsBackend:
+    """Point the app at the fakes. Call before importing app modules."""
+    import gspread
+    from google import genai
+    from google.oauth2 import service_account
+
+    data_dir = data_dir or tempfile.mkdtemp(prefix="skylark-loadtest-")
+    os.environ.update({
+        "PILOT_ROSTER_SHEET_ID": "fake-pilots",
+        "DRONE_FLEET_SHEET_ID": "fake-drones",
+        "MISSION_SHEET_ID": "fake-missions",
+        "GOOGLE_API_KEY": "fake",
+        "GOOGLE_SHEETS_JSON": "{}",
+        "JOURNAL_PATH": os.path.join(data_dir, "journal.db"),
+        "ROSTER_SNAPSHOT_PATH": os.path.join(data_dir, "roster.snapshot"),
+    })
+
+    backend = FakeSheetsBackend(sheets_latency, rate_limit_probability, seed)
+    client = FakeSheetsClient(generate_fleet(backend, pilots, drones, missions, seed))
+
+    gspread.authorize = lambda creds: client
+    service_account.Credentials.from_service_account_info = classmethod(lambda cls, info, **kw: None)
+    FakeGenaiClient.latency = llm_latency
+    genai.Client = FakeGenaiClient
+    return backend
@@ -0,0 +1,187 @@
+"""
+Drive concurrent operator sessions against /chat and /reset and report
+throughput and latency percentiles.
+
+In-process (fakes installed, app served over ASGI):
+    python -m loadtest.run --sessions 50 --turns 20 --sheets-latency 0.05
+
+Against a running server (e.g. one started with `python -m loadtest.serve`):
+    python -m loadtest.run --url http://127.0.0.1:8000
+
+Each session sends its own X-Client-Id, as the UI does, so the API's
+per-client rate limit applies per session. Pass --shared-client-id to
+send every session as one client and exercise that limit instead.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest import fakes
+
+
+def operator_script(rnd: random.Random, turns: int, missions: int, pilots: int) -> List[str]:
+    """A deterministic mix of the questions operators ask"""
+    def mission():
+        return f"M{rnd.randrange(missions):03d}"
+
+    templates = [
+        lambda: "Show me the fleet",
+        lambda: f"Check conflicts for {mission()} {mission()} {mission()}",
+        lambda: "Give me the readiness report",
+        lambda: "Who is free next week in Mumbai?",
+        lambda: f"Assign resources to {mission()}",
+        lambda: f"Put P{rnd.randrange(pilots):03d} on leave",
+        lambda: "Hello",
+    ]
+    weights = [3, 3, 1, 2, 2, 1, 1]
+    return [rnd.choices(templates, weights)[0]() for _ in range(turns)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, status: str, seconds: float):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    def report(self, elapsed: float) -> str:
+        total = sum(len(v) for v in self.latencies.values())
+        lines = [
+            f"Requests: {total} in {elapsed:.2f}s ({total / elapsed:.1f} req/s)",
+            "",
+            f"{'endpoint':<10}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}  statuses",
+        ]
+        for endpoint, values in sorted(self.latencies.items()):
+            statuses = ", ".join(f"{k}: {v}" for k, v in sorted(self.statuses[endpoint].items()))
+            lines.append(
+                f"{endpoint:<10}{len(values):>8}"
+                f"{percentile(values, 50) * 1000:>10.1f}"
+                f"{percentile(values, 90) * 1000:>10.1f}"
+                f"{percentile(values, 99) * 1000:>10.1f}"
+                f"{max(values) * 1000:>10.1f}  {statuses}"
+            )
+        return "\n".join(lines)
+
+
+async def run_session(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    script: List[str],
+    headers: Dict[str, str],
+    reset_every: int,
+    think_time: float
+):
+    for turn, message in enumerate(script, start=1):
+        start = time.perf_counter()
+        try:
+            response = await client.post("/chat", json={"message": message}, headers=headers)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        stats.record("/chat", status, time.perf_counter() - start)
+
+        if reset_every and turn % reset_every == 0:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/reset", headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            stats.record("/reset", status, time.perf_counter() - start)
+
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+def session_headers(args, index: int) -> Dict[str, str]:
+    if args.shared_client_id:
+        return {"X-Client-Id": "loadtest"}
+    return {"X-Client-Id": f"loadtest-{args.seed}-{index}"}
+
+
+async def run(args, app=None) -> Stats:
+    if app is not None:
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    stats = Stats()
+    rnd = random.Random(args.seed)
+    scripts = [operator_script(rnd, args.turns, args.missions, args.pilots) for _ in range(args.sessions)]
+
+    async with client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_session(client, stats, script, session_headers(args, index), args.reset_every, args.think_time)
+            for index, script in enumerate(scripts)
+        ))
+        elapsed = time.perf_counter() - start
+
+    print(stats.report(elapsed))
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load-test the drone fleet API with local fakes")
+    parser.add_argument("--url", help="Target a running server instead of an in-process app")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent operator sessions")
+    parser.add_argument("--turns", type=int, default=10, help="Chat messages per session")
+    parser.add_argument("--reset-every", type=int, default=5, help="Call /reset every N turns (0 = never)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between a session's requests")
+    parser.add_argument(
+        "--shared-client-id",
+        action="store_true",
+        help="Send every session as one client, to exercise the per-client rate limit"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout, matching the UI")
+    parser.add_argument("--sheets-latency", type=float, default=0.05, help="Seconds per fake Sheets call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability a Sheets call returns 429")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake model turn")
+    parser.add_argument("--pilots", type=int, default=60)
+    parser.add_argument("--drones", type=int, default=60)
+    parser.add_argument("--missions", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    app = None
+    backend = None
+    if not args.url:
+        backend = fakes.install(
+            sheets_latency=args.sheets_latency,
+            rate_limit_probability=args.rate_limit,
+            llm_latency=args.llm_latency,
+            pilots=args.pilots,
+            drones=args.drones,
+            missions=args.missions,
+            seed=args.seed
+        )
+        from app.main import app
+
+    asyncio.run(run(args, app))
+
+    if backend is not None:
+        print(f"\nFake Sheets calls: {backend.calls} ({backend.rate_limited} rate-limited)")
+
+
+if __name__ == "__main__":
+    main()
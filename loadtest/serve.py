@@ -0,0 +1,42 @@
+"""
+Run the real app on uvicorn against the local fakes, for load tests that
+should go through a real HTTP stack:
+
+    python -m loadtest.serve --sheets-latency 0.05 --llm-latency 0.2
+    python -m loadtest.run --url http://127.0.0.1:8000
+"""
+import argparse
+
+from loadtest import fakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the app with fake Sheets and Gemini backends")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--sheets-latency", type=float, default=0.05)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--pilots", type=int, default=60)
+    parser.add_argument("--drones", type=int, default=60)
+    parser.add_argument("--missions", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fakes.install(
+        sheets_latency=args.sheets_latency,
+        rate_limit_probability=args.rate_limit,
+        llm_latency=args.llm_latency,
+        pilots=args.pilots,
+        drones=args.drones,
+        missions=args.missions,
+        seed=args.seed
+    )
+
+    import uvicorn
+    from app.main import app
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import gspread
+import pytest
+
+from loadtest import fakes
+
+
+@pytest.fixture
+def store(tmp_path):
+    fakes.install(pilots=10, drones=4, missions=4, data_dir=str(tmp_path))
+    from app.config import get_settings
+    from app.services.roster_store import RosterStore
+    from app.services.journal import AssignmentJournal, JournalFlusher
+
+    get_settings.cache_clear()
+    store = RosterStore(
+        journal=AssignmentJournal(str(tmp_path / "journal.db")),
+        snapshot_path=str(tmp_path / "roster.snapshot")
+    )
+    store.start()
+    # Flush by hand instead of on the background thread
+    store.flusher.stop()
+    store.flusher = JournalFlusher(store.sheets, store.journal, interval=0.5)
+    yield store
+    store.close()
+
+
+def pilot_rows():
+    return gspread.authorize(None).sheets["fake-pilots"].rows
+
+
+def pilot_row(pilot_id):
+    return next(row for row in pilot_rows() if row["pilot_id"] == pilot_id)
+
+
+def test_write_for_deleted_row_does_not_block_the_journal(store):
+    store.update_pilot_status("P005", "on_leave")
+    pilot_rows().remove(pilot_row("P005"))
+    store.update_pilot_status("P006", "on_leave")
+
+    store.flusher.flush_once()
+
+    assert store.journal.pending() == []
+    assert pilot_row("P006")["status"] == "on_leave"
+
+    # An edit made directly in the sheet wins over entries already flushed
+    pilot_row("P006")["status"] = "available"
+    store.refresh(force=True)
+
+    assert store.get_pilot_by_id("P006").status == "available"
+    assert store.get_pilot_by_id("P005") is None
+
+
+def test_failing_resource_backs_off_alone(store, monkeypatch):
+    attempts = []
+    update = store.sheets.update_pilot_assignment
+
+    def flaky_update(pilot_id, *args):
+        attempts.append(pilot_id)
+        if pilot_id == "P005":
+            raise gspread.exceptions.GSpreadException("quota exceeded")
+        return update(pilot_id, *args)
+
+    monkeypatch.setattr(store.sheets, "update_pilot_assignment", flaky_update)
+    store.update_pilot_status("P005", "on_leave")
+    store.update_pilot_status("P006", "on_leave")
+
+    assert store.flusher.flush_once() is False
+    store.update_pilot_status("P007", "on_leave")
+    store.flusher.flush_once()
+
+    # P005 waits out its backoff; the others are written straight away
+    assert attempts == ["P005", "P006", "P007"]
+    assert [entry.resource_id for entry in store.journal.pending()] == ["P005"]
+    assert pilot_row("P007")["status"] == "on_leave"
@@ -1,14 +1,19 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import time
+import uuid
 
 # 1. Improved Config
 # When running in Docker, the UI talks to the API via localhost
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+# How often the dashboard asks the API whether the roster changed
+DASHBOARD_POLL_SECONDS = int(os.getenv("DASHBOARD_POLL_SECONDS", "10"))
 
 st.set_page_config(
-    page_title="Skylark Drone Manager", 
+    page_title="Skylark Drone Manager",
     page_icon="🚁",
     layout="wide" # Use wide layout for better data viewing
 )
@@ -19,64 +24,169 @@ st.markdown("""
     .stChatMessage { border-radius: 10px; margin-bottom: 10px; }
     .stSpinner { text-align: center; }
     </style>
-    """, unsafe_allow_resolve_html=True)
+    """, unsafe_allow_html=True)
 
 st.title("🚁 Drone Fleet AI Manager")
 st.caption("Strategic Pilot Assignment & Mission Conflict Detection System")
 
-# 2. Check Backend Health
+# 2. One pooled keep-alive HTTP session shared by every rerun
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    # Only retry idempotent calls; a retried /chat could assign twice
+    retries = Retry(total=2, backoff_factor=0.3, allowed_methods=["GET"], status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+http = get_http_session()
+
+# Every browser session reaches the API from this server's address, so
+# identify it explicitly for the API's per-client rate limits
+if "client_id" not in st.session_state:
+    st.session_state.client_id = uuid.uuid4().hex
+
+def client_headers(**extra):
+    return {"X-Client-Id": st.session_state.client_id, **extra}
+
+# 3. Check Backend Health (cached so reruns don't wait on the network)
+@st.cache_data(ttl=15, show_spinner=False)
 def check_backend():
     try:
-        # We assume the root or /chat exists
-        response = requests.get(API_URL.replace("/chat", ""), timeout=2)
-        return True
-    except:
+        response = http.get(f"{API_URL}/health", timeout=2)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
         return False
 
+def describe_error(response):
+    """Readable message for a non-200 backend response"""
+    if response.status_code == 429:
+        retry_after = response.headers.get("Retry-After", "a few")
+        return f"The fleet system is busy. Please try again in {retry_after} seconds."
+    return f"Backend Error ({response.status_code}): {response.text}"
+
+# 4. Roster data for the dashboard, refetched only when the version changes
+def fetch_all(resource):
+    """Page through one /api listing"""
+    items, offset = [], 0
+    while True:
+        response = http.get(
+            f"{API_URL}/api/{resource}",
+            params={"limit": 500, "offset": offset},
+            headers=client_headers(),
+            timeout=10
+        )
+        response.raise_for_status()
+        page = response.json()
+        items.extend(page["items"])
+        offset += page["limit"]
+        if offset >= page["total"]:
+            return items
+
+def load_roster():
+    """Return the cached roster, refreshing it if the backend's version moved on"""
+    cached = st.session_state.get("roster")
+    headers = client_headers(**({"If-None-Match": cached["etag"]} if cached else {}))
+    response = http.get(f"{API_URL}/api/roster/version", headers=headers, timeout=2)
+    if response.status_code == 304:
+        return cached
+    response.raise_for_status()
+
+    roster = {
+        "etag": response.headers.get("ETag"),
+        "version": response.json()["version"],
+        "pilots": fetch_all("pilots"),
+        "drones": fetch_all("drones"),
+        "missions": fetch_all("missions"),
+        "fetched_at": time.strftime("%H:%M:%S"),
+    }
+    st.session_state.roster = roster
+    return roster
+
+def format_rows(rows):
+    """Flatten list columns so tables stay readable"""
+    return [
+        {key: ", ".join(value) if isinstance(value, list) else value for key, value in row.items()}
+        for row in rows
+    ]
+
+@st.fragment(run_every=DASHBOARD_POLL_SECONDS)
+def fleet_dashboard():
+    try:
+        roster = load_roster()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Could not load fleet data: {e}")
+        return
+
+    pilots, drones, missions = roster["pilots"], roster["drones"], roster["missions"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pilots available", sum(p["status"] == "available" for p in pilots), f"of {len(pilots)}", delta_color="off")
+    col2.metric("Drones available", sum(d["status"] == "available" for d in drones), f"of {len(drones)}", delta_color="off")
+    col3.metric("Critical missions", sum(m["priority"] == "critical" for m in missions), f"of {len(missions)}", delta_color="off")
+
+    pilot_tab, drone_tab, mission_tab = st.tabs(["Pilots", "Drones", "Missions"])
+    with pilot_tab:
+        st.dataframe(format_rows(pilots), width="stretch", hide_index=True)
+    with drone_tab:
+        st.dataframe(format_rows(drones), width="stretch", hide_index=True)
+    with mission_tab:
+        st.dataframe(format_rows(missions), width="stretch", hide_index=True)
+
+    st.caption(f"Roster version {roster['version']} · fetched at {roster['fetched_at']}")
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-# Display chat history
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
-
-# 3. Chat Input Logic
-if prompt := st.chat_input("Ask about pilots, drones, or mission assignments..."):
-    # Display user message immediately
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-    
-    # Get AI response
-    with st.chat_message("assistant"):
-        with st.spinner("Consulting Fleet Database..."):
-            try:
-                # Ensure timeout is long enough for AI tool execution (Google Sheets can be slow)
-                response = requests.post(
-                    f"{API_URL}/chat",
-                    json={"message": prompt},
-                    timeout=60 
-                )
-                
-                if response.status_code == 200:
-                    ai_response = response.json()["response"]
-                    st.markdown(ai_response)
-                    st.session_state.messages.append({"role": "assistant", "content": ai_response})
-                else:
-                    st.error(f"Backend Error ({response.status_code}): {response.text}")
-            except requests.exceptions.ConnectionError:
-                st.error("Connection Error: UI could not reach the Backend API.")
-                st.info(f"Checking {API_URL}... Make sure the FastAPI server is running.")
-            except Exception as e:
-                st.error(f"Unexpected Error: {str(e)}")
+chat_tab, dashboard_tab = st.tabs(["💬 Assistant", "📊 Fleet Dashboard"])
+
+with dashboard_tab:
+    fleet_dashboard()
+
+with chat_tab:
+    # Display chat history
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    # 5. Chat Input Logic
+    if prompt := st.chat_input("Ask about pilots, drones, or mission assignments..."):
+        # Display user message immediately
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Get AI response
+        with st.chat_message("assistant"):
+            with st.spinner("Consulting Fleet Database..."):
+                try:
+                    # Ensure timeout is long enough for AI tool execution (Google Sheets can be slow)
+                    response = http.post(
+                        f"{API_URL}/chat",
+                        json={"message": prompt},
+                        headers=client_headers(),
+                        timeout=60
+                    )
+
+                    if response.status_code == 200:
+                        ai_response = response.json()["response"]
+                        st.markdown(ai_response)
+                        st.session_state.messages.append({"role": "assistant", "content": ai_response})
+                    else:
+                        st.error(describe_error(response))
+                except requests.exceptions.ConnectionError:
+                    check_backend.clear()
+                    st.error("Connection Error: UI could not reach the Backend API.")
+                    st.info(f"Checking {API_URL}... Make sure the FastAPI server is running.")
+                except Exception as e:
+                    st.error(f"Unexpected Error: {str(e)}")
 
 # Sidebar
 with st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/3120/3120301.png", width=100)
     st.header("Fleet Control")
-    
+
     # Status Indicator
     if check_backend():
         st.success("API System: Online")
@@ -85,30 +195,36 @@ with st.sidebar:
 
     if st.button("🔄 Clear Chat History", use_container_width=True):
         try:
-            requests.post(f"{API_URL}/reset")
-            st.session_state.messages = []
-            st.success("Memory cleared!")
-            time.sleep(1)
-            st.rerun()
-        except:
+            response = http.post(f"{API_URL}/reset", headers=client_headers(), timeout=30)
+            if response.status_code == 200:
+                st.session_state.messages = []
+                st.success("Memory cleared!")
+                time.sleep(1)
+                st.rerun()
+            else:
+                st.error(describe_error(response))
+        except requests.exceptions.RequestException:
             st.error("Reset failed. Is the API running?")
-    
+
     st.divider()
-    
+
     st.markdown("### 📋 Command Guide")
     with st.expander("Resource Queries"):
         st.markdown("""
         - "List all available pilots"
         - "Show drones in New York"
         - "Which pilots have 'thermal' skills?"
+        - "Who is free between 2026-11-03 and 2026-11-07 in Mumbai?"
         """)
-    
+
     with st.expander("Mission Operations"):
         st.markdown("""
         - "Show current missions"
         - "Check conflicts for Mission M102"
         - "Assign resources to Mission M105"
+        - "Give me the fleet readiness report"
+        - "Which assignments need re-planning?"
         """)
-    
+
     st.divider()
-    st.caption("v1.2 | Connected to Google Sheets & Groq/Gemini")
\ No newline at end of file
+    st.caption("v1.2 | Connected to Google Sheets & Groq/Gemini")